@@ -0,0 +1,123 @@
+# Memory benchmark for the categorizer's per-file run state
+# Tracks the same synthetic files three ways and reports traced bytes per file:
+# the original set/dict/list bookkeeping, FileTable in memory, and FileTable
+# spilled to a temporary file. Queued WorkItems are reported separately, and
+# a whole run (every file queued up front, then drained into the tracked
+# state) is measured for its peak. A run without --labels tracks nothing per
+# file, so its peak is the queue alone; the queue, not the table, bounds a run.
+
+import argparse
+import gc
+import importlib.util
+import os
+import time
+import tracemalloc
+
+def load_categorizer(path):
+    """Import the categorizer script as a module"""
+    spec = importlib.util.spec_from_file_location("dora", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def file_names(count):
+    """Distinct, realistically long PDF names"""
+    return (f"quarterly-report-{index:08d}-final.pdf" for index in range(count))
+
+class OriginalState:
+    """The processed set, location dict and formatted move log the mover used to keep"""
+    def __init__(self, root_folder="/data/library"):
+        self.root_folder = root_folder
+        self.processed_files = set()
+        self.file_locations = {}
+        self.moves_log = []
+
+    def add(self, name, label):
+        self.processed_files.add(name)
+        # Only the destination folder's name was kept, split off the full destination path
+        destination = os.path.join(self.root_folder, label, name)
+        self.file_locations[name] = os.path.dirname(destination).split(os.path.sep)[-1]
+        self.moves_log.append(f"{name:30} → {label}")
+
+class Untracked:
+    """What the mover keeps per file without --labels: nothing"""
+    def add(self, name, label):
+        pass
+
+def track(state, names, labels):
+    """Record every file in a state object"""
+    for index, name in enumerate(names):
+        state.add(name, labels[index % len(labels)])
+    return state
+
+def queue_items(dora, names, root_folder="/data/library"):
+    """A work queue holding every file, as it is before workers take any"""
+    work_queue = dora.WorkQueue()
+    for name in names:
+        work_queue.put(dora.WorkItem(os.path.join(root_folder, name), 1024 * 1024))
+    work_queue.close()
+    return work_queue
+
+def run(dora, names, labels, state):
+    """Queue every file up front, then drain the queue into a state object, as a run does"""
+    work_queue = queue_items(dora, names)
+    index = 0
+    while True:
+        item = work_queue.get()
+        if item is None:
+            return state
+        state.add(item.name, labels[index % len(labels)])
+        work_queue.task_done()
+        index += 1
+
+def measure(build):
+    """Return (peak traced bytes, retained traced bytes, seconds) for building a structure"""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    state = build()
+    elapsed = time.perf_counter() - start
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del state
+    return peak, retained, elapsed
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure per-file memory of the run state")
+    parser.add_argument("--target", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "codeV1.4.py"),
+                        help="categorizer script to benchmark")
+    parser.add_argument("--files", type=int, default=1_000_000, help="synthetic files to track")
+    args = parser.parse_args()
+
+    dora = load_categorizer(args.target)
+    labels = dora.category_labels(dora.define_categories())
+
+    # Names are created inside each measurement, as they would be read from the directory
+    states = {
+        "original set/dict/list": OriginalState,
+        "FileTable": dora.FileTable,
+        "FileTable (spilled)": lambda: dora.FileTable(spill=True),
+    }
+    cases = {name: (lambda state=state: track(state(), file_names(args.files), labels))
+             for name, state in states.items()}
+    cases["queued WorkItems"] = lambda: queue_items(dora, file_names(args.files))
+    states["nothing (no --labels)"] = Untracked
+    for name, state in states.items():
+        cases[f"run, {name}"] = lambda state=state: run(dora, file_names(args.files), labels, state())
+
+    print(f"Tracking {args.files} files")
+    print(f"{'State':32} {'Peak B/file':>12} {'Kept B/file':>12} {'Seconds':>9}")
+    print("-" * 68)
+    peaks = {}
+    kept = {}
+    for name, build in cases.items():
+        peak, retained, elapsed = measure(build)
+        peaks[name] = peak
+        kept[name] = retained
+        print(f"{name:32} {peak / args.files:12.1f} {retained / args.files:12.1f} {elapsed:9.2f}")
+
+    # While files are pending the queue dominates, so a whole run gains less than the table alone
+    baseline = "original set/dict/list"
+    for name in ("FileTable", "FileTable (spilled)"):
+        print(f"{name} keeps {kept[baseline] / kept[name]:.1f}x less than the original bookkeeping; "
+              f"a whole run peaks {peaks[f'run, {baseline}'] / peaks[f'run, {name}']:.1f}x lower")
@@ -0,0 +1,83 @@
+# Overhead benchmark for live progress reporting
+# Runs the categorizer's worker pipeline over synthetic files with a trivial
+# extractor, which makes per-file work as cheap as it gets and the relative
+# cost of progress tracking as large as it gets. Reports the cost of the
+# per-file counter updates and the wall time with the sampler off and on.
+
+import argparse
+import io
+import os
+import statistics
+import tempfile
+import time
+import timeit
+
+from bench_memory import load_categorizer
+
+TEXTS = ["python pandas numpy", "sql mysql", "deep learning cnn", "encryption cipher", "nothing to see"]
+
+def plain_text(pdf_bytes):
+    """Stand-in extractor: the synthetic files hold their text as plain bytes"""
+    return pdf_bytes.decode("utf-8").lower()
+
+def run_once(dora, files, workers, progress_interval=None):
+    """Categorize a fresh folder of synthetic files; return seconds per file and the sampler's share"""
+    with tempfile.TemporaryDirectory() as root_folder:
+        for index in range(files):
+            with open(os.path.join(root_folder, f"file-{index:07d}.pdf"), "w") as f:
+                f.write(TEXTS[index % len(TEXTS)])
+        categories = dora.create_folder_structure(root_folder)
+        file_mover = dora.ThreadSafeFileMover(categories, os.path.join(root_folder, dora.MOVE_LOG_NAME))
+        work_queue = dora.WorkQueue()
+        process_file = dora.categorize_and_move_files(root_folder, categories, file_mover, work_queue,
+                                                      extractor=plain_text)
+        pool = dora.WorkerPool(work_queue, process_file)
+        progress = None
+        if progress_interval:
+            progress = dora.ProgressReporter(work_queue, [file_mover], "json", io.StringIO(), progress_interval)
+
+        start = time.perf_counter()
+        pool.resize(workers)
+        if progress:
+            progress.start()
+        dora.queue_files(root_folder, work_queue, file_mover.io_scheduler)
+        work_queue.close()
+        pool.join()
+        if progress:
+            progress.stop()
+        elapsed = time.perf_counter() - start
+        file_mover.close()
+        return elapsed / files, progress.overhead() if progress else 0.0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure the hot-path overhead of progress reporting")
+    parser.add_argument("--target", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "codeV1.4.py"),
+                        help="categorizer script to benchmark")
+    parser.add_argument("--files", type=int, default=5000, help="synthetic files per run")
+    parser.add_argument("--workers", type=int, default=4, help="worker threads")
+    parser.add_argument("--runs", type=int, default=3, help="runs per configuration")
+    parser.add_argument("--interval", type=float, default=0.5, help="sampling period in seconds")
+    args = parser.parse_args()
+
+    dora = load_categorizer(args.target)
+
+    # The only hot-path cost: four counter updates per file on the worker's own stats
+    stats = dora.WorkerStats(dora.define_categories())
+    def bump():
+        stats.classified += 1
+        stats.moved += 1
+        stats.handled_bytes += 4096
+        stats.failed += 0
+    counter_seconds = min(timeit.repeat(bump, number=100_000, repeat=5)) / 100_000
+
+    off = statistics.median(run_once(dora, args.files, args.workers)[0] for _ in range(args.runs))
+    on_runs = [run_once(dora, args.files, args.workers, args.interval) for _ in range(args.runs)]
+    on = statistics.median(per_file for per_file, _ in on_runs)
+    sampler_share = statistics.median(share for _, share in on_runs)
+
+    print(f"{args.files} files, {args.workers} workers, {args.runs} runs, sampling every {args.interval}s")
+    print("-" * 50)
+    print(f"Per file, sampler off      : {off * 1e6:9.1f} us")
+    print(f"Per file, sampler on       : {on * 1e6:9.1f} us ({(on / off - 1) * 100:+.2f}%)")
+    print(f"Counter updates per file   : {counter_seconds * 1e6:9.3f} us ({counter_seconds / off * 100:.3f}% of a file)")
+    print(f"Sampler share of wall time : {sampler_share * 100:9.3f}%")
@@ -0,0 +1,56 @@
+# Startup benchmark for the categorizer's subcommands
+# Runs each subcommand in a fresh interpreter and reports wall time, total import
+# time from -X importtime, and whether PyPDF2 was loaded on that path.
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+def measure(command, runs):
+    """Return (median wall ms, median import ms, PyPDF2 imported) for a command"""
+    wall_times = []
+    import_times = []
+    loaded_pdf = False
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, "-X", "importtime"] + command,
+                                stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+        wall_times.append((time.perf_counter() - start) * 1000)
+
+        # Lines look like "import time:   self [us] | cumulative | module"; sum the self times
+        total_us = 0
+        for line in result.stderr.splitlines():
+            if not line.startswith("import time:") or "self [us]" in line:
+                continue
+            fields = line[len("import time:"):].split("|")
+            total_us += int(fields[0])
+            if fields[2].strip() == "PyPDF2":
+                loaded_pdf = True
+        import_times.append(total_us / 1000)
+    return statistics.median(wall_times), statistics.median(import_times), loaded_pdf
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure startup time per subcommand")
+    parser.add_argument("--target", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "codeV1.4.py"),
+                        help="script or .pyz to benchmark")
+    parser.add_argument("--runs", type=int, default=10, help="runs per subcommand")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root_folder:
+        commands = {
+            "--help": ["--help"],
+            "tree": ["tree", root_folder],
+            "report": ["report", root_folder],
+            "run (empty root)": ["run", root_folder],
+        }
+
+        print(f"Target: {args.target} ({args.runs} runs each)")
+        print(f"{'Subcommand':20} {'Wall ms':>9} {'Import ms':>10}  PyPDF2")
+        print("-" * 50)
+        for name, command in commands.items():
+            wall_ms, import_ms, loaded_pdf = measure([args.target] + command, args.runs)
+            print(f"{name:20} {wall_ms:9.1f} {import_ms:10.1f}  {'yes' if loaded_pdf else 'no'}")
@@ -0,0 +1,53 @@
+# Build dora.pyz, a single-file executable of the PDF categorizer
+# The script is bundled as module "dora" with precompiled bytecode next to it,
+# so zipimport loads the .pyc directly instead of compiling on every start.
+# Build with the same Python version that will run the archive.
+
+import argparse
+import compileall
+import os
+import py_compile
+import shutil
+import subprocess
+import sys
+import tempfile
+import zipapp
+
+SOURCE_SCRIPT = "codeV1.4.py"
+
+MAIN_MODULE = """import sys
+from dora import main
+sys.exit(main())
+"""
+
+def build(target, with_deps=True):
+    """Assemble the archive in a temporary folder and write it to target"""
+    here = os.path.dirname(os.path.abspath(__file__))
+    with tempfile.TemporaryDirectory() as build_dir:
+        shutil.copy(os.path.join(here, SOURCE_SCRIPT), os.path.join(build_dir, "dora.py"))
+        with open(os.path.join(build_dir, "__main__.py"), "w") as f:
+            f.write(MAIN_MODULE)
+
+        # Vendor PyPDF2 so the archive runs without a separate install
+        if with_deps:
+            subprocess.run([sys.executable, "-m", "pip", "install", "--quiet", "--no-compile",
+                            "--target", build_dir, "PyPDF2"], check=True)
+            for name in os.listdir(build_dir):
+                if name.endswith((".dist-info", ".egg-info")):
+                    shutil.rmtree(os.path.join(build_dir, name))
+
+        # zipimport only finds bytecode stored beside the source (legacy layout);
+        # unchecked hashes skip the source timestamp check at import
+        compileall.compile_dir(build_dir, quiet=1, legacy=True, optimize=0,
+                               invalidation_mode=py_compile.PycInvalidationMode.UNCHECKED_HASH)
+
+        # Stored uncompressed so imports do not pay for inflating
+        zipapp.create_archive(build_dir, target, interpreter="/usr/bin/env python3")
+    print(f"Built {target}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build dora.pyz")
+    parser.add_argument("--output", default="dora.pyz", help="archive to write")
+    parser.add_argument("--no-deps", action="store_true", help="do not bundle PyPDF2")
+    args = parser.parse_args()
+    build(args.output, with_deps=not args.no_deps)
@@ -0,0 +1,212 @@
+# Bulk PDF metadata extractor
+# Walks a folder tree with a process pool and streams one row per PDF to CSV or NDJSON.
+# Only the trailer, the info dictionary and the XMP stream are read, never page content.
+# Rows are written in walk order, and a side file records where the last complete chunk
+# ended, so an interrupted run resumes after it.
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from PyPDF2 import PdfReader
+
+# Files per task sent to a worker process, and tasks in flight per worker
+CHUNK_SIZE = 64
+CHUNKS_PER_WORKER = 4
+
+# Suffix of the side file holding the resume point next to the output
+RESUME_SUFFIX = ".resume"
+
+# Columns written to CSV; NDJSON rows also carry the full info dictionary
+CSV_FIELDS = ["path", "size", "mtime", "pages", "encrypted", "title", "author", "subject",
+              "keywords", "creator", "producer", "creation_date", "mod_date",
+              "xmp_title", "xmp_creator", "xmp_description", "xmp_keywords", "xmp_create_date", "error"]
+
+# Info dictionary keys mapped to row fields
+INFO_FIELDS = {"/Title": "title", "/Author": "author", "/Subject": "subject", "/Keywords": "keywords",
+               "/Creator": "creator", "/Producer": "producer", "/CreationDate": "creation_date",
+               "/ModDate": "mod_date"}
+
+def walk_pdfs(root_folder, after=()):
+    """Yield every PDF under root_folder in a stable, sorted depth-first order
+    
+    With after, the parts of a path relative to root_folder, only the files
+    that come after that path in this order are yielded, whether or not it
+    still exists. Folders that come entirely before it are not listed.
+    """
+    try:
+        entries = sorted(os.scandir(root_folder), key=lambda entry: entry.name)
+    except OSError:
+        return
+    for entry in entries:
+        rest = ()
+        if after:
+            if entry.name < after[0]:
+                continue
+            if entry.name == after[0]:
+                rest = after[1:]
+                if not entry.is_dir(follow_symlinks=False):
+                    continue
+            after = ()
+        if entry.is_dir(follow_symlinks=False):
+            yield from walk_pdfs(entry.path, rest)
+        elif entry.name.lower().endswith(".pdf") and entry.is_file():
+            yield entry.path
+
+def _text(value):
+    """Flatten an XMP value (language map, list or date) into a string"""
+    if value is None:
+        return None
+    if isinstance(value, dict):
+        value = value.get("x-default") or next(iter(value.values()), None)
+    elif isinstance(value, (list, tuple)):
+        value = "; ".join(str(item) for item in value)
+    return str(value) if value is not None else None
+
+def read_metadata(path):
+    """Read one file's metadata; failures are recorded in the row instead of raised"""
+    row = {"path": path}
+    try:
+        stat_result = os.stat(path)
+        row["size"] = stat_result.st_size
+        row["mtime"] = int(stat_result.st_mtime)
+
+        # Given a path, PdfReader loads the whole file; an open file lets it seek to the objects it needs
+        with open(path, "rb") as f:
+            reader = PdfReader(f, strict=False)
+            row["encrypted"] = reader.is_encrypted
+            if reader.is_encrypted:
+                # Only the trailer is readable without a password
+                return row
+
+            # The page count comes from the page tree root, not from page content
+            row["pages"] = len(reader.pages)
+
+            info = reader.metadata or {}
+            for key, field in INFO_FIELDS.items():
+                if key in info:
+                    row[field] = str(info[key])
+            row["info"] = {key.lstrip("/"): str(value) for key, value in info.items()}
+
+            xmp = reader.xmp_metadata
+            if xmp is not None:
+                row["xmp_title"] = _text(xmp.dc_title)
+                row["xmp_creator"] = _text(xmp.dc_creator)
+                row["xmp_description"] = _text(xmp.dc_description)
+                row["xmp_keywords"] = _text(xmp.pdf_keywords)
+                row["xmp_create_date"] = _text(xmp.xmp_create_date)
+    except Exception as e:
+        row["error"] = f"{type(e).__name__}: {e}"
+    return row
+
+def read_chunk(paths):
+    """Read the metadata of a batch of files in a worker process"""
+    return [read_metadata(path) for path in paths]
+
+def chunked(paths, size):
+    """Group an iterator of paths into lists of at most size"""
+    chunk = []
+    for path in paths:
+        chunk.append(path)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def last_written_path(output_path):
+    """Cut the output back to its last complete chunk and return the path of that chunk's last row
+    
+    The side file is only updated after a chunk is flushed, so anything past
+    its offset is a partial or unrecorded chunk and is redone. Counting rows by
+    offset instead of by line keeps multi-line CSV fields intact.
+    """
+    resume_path = output_path + RESUME_SUFFIX
+    if not os.path.exists(output_path):
+        return None
+    if not os.path.exists(resume_path):
+        print(f"No resume point for {output_path}; starting over", file=sys.stderr)
+        return None
+    with open(resume_path, encoding="utf-8") as f:
+        point = json.load(f)
+    with open(output_path, "rb+") as f:
+        f.truncate(point["offset"])
+    return point["path"]
+
+def save_resume_point(output_path, output, last_path):
+    """Flush the output and atomically record its size and last row's path"""
+    output.flush()
+    resume_path = output_path + RESUME_SUFFIX
+    with open(resume_path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump({"path": last_path, "offset": os.fstat(output.fileno()).st_size}, f)
+    os.replace(resume_path + ".tmp", resume_path)
+
+def extract_all(root_folder, output_path, output_format, workers=None, restart=False):
+    """Stream metadata rows for every PDF under root_folder into output_path"""
+    last_path = None if restart else last_written_path(output_path)
+    relative_path = os.path.relpath(last_path, root_folder) if last_path else None
+    if relative_path and relative_path.split(os.sep)[0] == os.pardir:
+        print(f"Last recorded file {last_path} is outside {root_folder}; starting over", file=sys.stderr)
+        last_path = None
+    if last_path:
+        # Resume at the first file after the recorded one, even if that file has since been removed
+        print(f"Resuming after {last_path}")
+        paths = walk_pdfs(root_folder, tuple(relative_path.split(os.sep)))
+    else:
+        paths = walk_pdfs(root_folder)
+
+    mode = "a" if last_path else "w"
+    workers = workers or os.cpu_count() or 1
+    count = errors = 0
+    start_time = time.time()
+
+    with open(output_path, mode, encoding="utf-8", newline="") as output, \
+            ProcessPoolExecutor(max_workers=workers) as executor:
+        writer = None
+        if output_format == "csv":
+            writer = csv.DictWriter(output, fieldnames=CSV_FIELDS, extrasaction="ignore")
+            if mode == "w":
+                writer.writeheader()
+
+        # A bounded window of chunks keeps memory flat; the oldest is written first to keep walk order
+        in_flight = deque()
+        chunks = chunked(paths, CHUNK_SIZE)
+        while True:
+            while len(in_flight) < workers * CHUNKS_PER_WORKER:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    break
+                in_flight.append(executor.submit(read_chunk, chunk))
+            if not in_flight:
+                break
+
+            rows = in_flight.popleft().result()
+            for row in rows:
+                if writer:
+                    writer.writerow(row)
+                else:
+                    output.write(json.dumps(row, ensure_ascii=False, default=str) + "\n")
+                count += 1
+                errors += "error" in row
+            save_resume_point(output_path, output, rows[-1]["path"])
+
+    elapsed = time.time() - start_time
+    rate = count / elapsed if elapsed else 0
+    print(f"Wrote {count} rows ({errors} errors) to {output_path} in {elapsed:.2f} seconds ({rate:.0f} files/sec)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Extract PDF metadata for a whole folder tree")
+    parser.add_argument("root", help="folder to walk")
+    parser.add_argument("-o", "--output", default="metadata.ndjson", help="output file (.csv or .ndjson)")
+    parser.add_argument("--format", choices=["csv", "ndjson"], help="output format (default: from the extension)")
+    parser.add_argument("--workers", type=int, help="worker processes (default: CPU count)")
+    parser.add_argument("--restart", action="store_true", help="overwrite the output instead of resuming")
+    args = parser.parse_args()
+
+    output_format = args.format or ("csv" if args.output.lower().endswith(".csv") else "ndjson")
+    extract_all(args.root, args.output, output_format, args.workers, args.restart)
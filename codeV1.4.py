@@ -1,92 +1,1425 @@
 # PDF File Categorization System
 # This script categorizes PDF files into predefined folders based on content analysis
-# Features: Multi-threading, Content Analysis, User Validation, and Performance Metrics
+# Features: Multi-threading, Content Analysis, Evaluation Against Labels, and Performance Metrics
+#
+# PyPDF2 and the archive and multiprocessing modules are imported only by the code
+# paths that use them, so cheap subcommands like "tree" and "report" start fast.
 
+import argparse
+import errno
+import functools
+import glob
+import heapq
+import io
+import itertools
+import json
+import math
 import os
-import PyPDF2
+import re
+import sys
 import time
 import threading
-from queue import Queue
+from array import array
+from collections import deque
+from queue import Queue, Full
 
-class FileValidator:
-    """Handles validation of file categorization accuracy based on user input"""
-    def __init__(self):
-        self.correct_paths = {}
-        
-    def add_correct_path(self, filename, correct_path):
-        """Store the correct path for a file as specified by user"""
-        self.correct_paths[filename] = correct_path
-        
-    def calculate_accuracy(self, file_locations):
-        """Calculate the accuracy of automatic categorization vs user input"""
-        if not self.correct_paths:
-            return 0
-            
-        correct_count = 0
-        for filename, actual_path in file_locations.items():
-            if filename in self.correct_paths:
-                if self.correct_paths[filename] == actual_path:
-                    correct_count += 1
+# Concurrency limits for reads and moves, per kind of storage device
+DEVICE_CONCURRENCY = {"rotational": 2, "network": 4, "ssd": 16, "unknown": 4}
+
+# Filesystem types treated as network mounts
+NETWORK_FILESYSTEMS = {"nfs", "nfs4", "cifs", "smb3", "smbfs", "ceph", "fuse.cephfs",
+                       "glusterfs", "fuse.glusterfs", "fuse.sshfs", "9p", "lustre", "afs"}
+
+# Read-ahead: maximum look-ahead, memory for buffered files, and warm-up chunk size
+PREFETCH_MAX_DEPTH = 8
+PREFETCH_BUFFER_BYTES = 64 * 1024 * 1024
+PREFETCH_CHUNK_BYTES = 256 * 1024
+
+# Worker pool: floor and ceiling on workers, sampling period, and change thresholds
+POOL_MIN_WORKERS = 2
+POOL_MAX_WORKERS = 32
+POOL_SAMPLE_SECONDS = 1.0
+POOL_TOLERANCE = 0.05
+POOL_CPU_BUSY = 0.9
+
+# Shortest-job-first: page weight in bytes, aging credit per second waited,
+# fast-lane size limit and workers, and how much of the file tail to search
+SJF_PAGE_COST_BYTES = 64 * 1024
+SJF_AGING_BYTES_PER_SECOND = 4 * 1024 * 1024
+SJF_FAST_LANE_BYTES = 512 * 1024
+SJF_TAIL_BYTES = 16 * 1024
+FAST_LANE_WORKERS = 2
+
+PAGE_COUNT_PATTERN = re.compile(rb"/Count\s+(\d+)")
+LINEARIZED_PAGES_PATTERN = re.compile(rb"/Linearized\b[^>]*?/N\s+(\d+)")
+
+# Move records buffered per worker before each write, and the log's name in the root folder
+MOVE_LOG_BATCH = 256
+MOVE_LOG_NAME = "moves.ndjson"
+
+# Bundles scanned as virtual directories, and memory for tar members awaiting placement
+ARCHIVE_SUFFIXES = (".zip", ".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz")
+ARCHIVE_BUFFER_BYTES = 256 * 1024 * 1024
+
+# Batch roots scanned at the same time
+BATCH_SCAN_THREADS = 8
+
+# Extracted texts committed to the text cache at a time, and misclassified files printed
+TEXT_CACHE_BATCH = 500
+MISCLASSIFIED_SHOWN = 50
+
+# Multi-node coordination: lease refresh period, expiry, and the shared claims folder
+LEASE_HEARTBEAT_SECONDS = 10
+LEASE_TIMEOUT_SECONDS = 60
+CLAIMS_FOLDER_NAME = ".dora-claims"
+
+# Progress: redraw period on a terminal, JSON line period otherwise, and the rate window
+PROGRESS_TTY_SECONDS = 0.5
+PROGRESS_JSON_SECONDS = 10
+PROGRESS_WINDOW_SECONDS = 10
+
+# Profiling: allocation sites shown per stage
+PROFILE_TOP_SITES = 10
+
+# Fast extractor: TJ gap (thousandths of an em) read as a space, form nesting followed,
+# and font encodings whose bytes can be read as plain cp1252 text
+TJ_WORD_GAP = 200
+FORM_XOBJECT_DEPTH = 3
+STANDARD_ENCODINGS = {"/WinAnsiEncoding", "/MacRomanEncoding", "/StandardEncoding", "/PDFDocEncoding"}
+TEXT_MOVE_OPERATORS = {b"Td", b"TD", b"T*", b"Tm", b"BT", b"ET"}
+
+# Literal strings (one level of nested parentheses), hex strings, arrays, numbers and operators
+CONTENT_TOKEN_PATTERN = re.compile(
+    rb"\((?:[^()\\]|\\.|\((?:[^()\\]|\\.)*\))*\)"
+    rb"|<<|>>|<[0-9A-Fa-f\s]*>|\[|\]|/[^\s/\[\]()<>{}%]*"
+    rb"|[-+]?(?:\d+\.?\d*|\.\d+)|[A-Za-z'\"*]+|%[^\r\n]*", re.S)
+LITERAL_ESCAPE_PATTERN = re.compile(rb"\\([0-7]{1,3}|\r\n|.)", re.S)
+LITERAL_ESCAPES = {b"n": b"\n", b"r": b"\r", b"t": b"\t", b"b": b"\b", b"f": b"\f",
+                   b"\r\n": b"", b"\n": b"", b"\r": b""}
+INLINE_IMAGE_PATTERN = re.compile(rb"\bBI\b.*?\bID\b.*?\bEI\b", re.S)
+
+# Run text extraction in worker processes instead of the worker threads
+EXTRACT_IN_PROCESSES = False
+
+class IOScheduler:
+    """Groups file reads and moves by device and limits concurrency per device"""
+    def __init__(self, limits=None):
+        self.limits = dict(DEVICE_CONCURRENCY)
+        if limits:
+            self.limits.update(limits)
+        self.devices_lock = threading.Lock()
+        self.devices = {}
+        self.dir_devices = {}
+        self.mounts = self._read_mounts()
+
+    def _read_mounts(self):
+        """Map "major:minor" to filesystem type from /proc/self/mountinfo"""
+        mounts = {}
+        try:
+            with open("/proc/self/mountinfo") as f:
+                for line in f:
+                    fields, _, rest = line.partition(" - ")
+                    fields = fields.split()
+                    if len(fields) > 2 and rest:
+                        mounts[fields[2]] = rest.split()[0]
+        except OSError:
+            pass
+        return mounts
+
+    def _device_kind(self, dev):
+        """Classify a device as rotational, network, ssd or unknown"""
+        dev_id = f"{os.major(dev)}:{os.minor(dev)}"
+        if self.mounts.get(dev_id) in NETWORK_FILESYSTEMS:
+            return "network"
+        # Partitions keep their queue settings on the parent disk
+        sys_path = os.path.realpath(os.path.join("/sys/dev/block", dev_id))
+        for queue_dir in (sys_path, os.path.dirname(sys_path)):
+            try:
+                with open(os.path.join(queue_dir, "queue", "rotational")) as f:
+                    return "rotational" if f.read().strip() == "1" else "ssd"
+            except OSError:
+                continue
+        return "unknown"
+
+    def _device(self, dev):
+        """Return (kind, semaphore) for a device, creating it on first use"""
+        with self.devices_lock:
+            if dev not in self.devices:
+                kind = self._device_kind(dev)
+                self.devices[dev] = (kind, threading.BoundedSemaphore(self.limits[kind]))
+            return self.devices[dev]
+
+    def device_of(self, path):
+        """Return the st_dev of the directory holding path (cached per directory)"""
+        folder = os.path.dirname(os.path.abspath(path))
+        dev = self.dir_devices.get(folder)
+        if dev is None:
+            dev = os.stat(folder).st_dev
+            self.dir_devices[folder] = dev
+        return dev
+
+    def slot(self, path):
+        """Semaphore limiting concurrent I/O on the device holding path"""
+        return self._device(self.device_of(path))[1]
+
+    def kind_of(self, folder):
+        """Return the kind of device holding folder"""
+        return self._device(self.device_of(os.path.join(folder, "_")))[0]
+
+    def scan(self, folder):
+        """List the PDF files and bundles in folder in device-friendly order"""
+        entries = [entry for entry in os.scandir(folder)
+                   if (entry.name.endswith('.pdf') or is_archive(entry.name)) and entry.is_file()]
+        if self.kind_of(folder) == "rotational":
+            # Inode order approximates on-disk order and avoids seek storms
+            entries.sort(key=lambda entry: entry.inode())
+        return entries
+
+class Prefetcher:
+    """Warms upcoming files while workers are busy parsing the current one"""
+    def __init__(self, io_scheduler, max_depth=PREFETCH_MAX_DEPTH, buffer_bytes=PREFETCH_BUFFER_BYTES):
+        self.io_scheduler = io_scheduler
+        self.max_depth = max_depth
+        self.buffer_bytes = buffer_bytes
+        self.depth = 1
+        
+        # Smoothed read and parse times drive the look-ahead depth
+        self.read_time = 0.0
+        self.parse_time = 0.0
+        
+        self.lock = threading.Lock()
+        self.issued = set()
+        self.buffers = {}
+        self.buffered_bytes = 0
+        
+        # Without posix_fadvise, a background thread reads files into a buffer pool
+        self.use_fadvise = hasattr(os, "posix_fadvise")
+        if not self.use_fadvise:
+            self.pending = Queue(maxsize=max_depth * 4)
+            threading.Thread(target=self._buffer_worker, daemon=True).start()
+            
+    def prefetch(self, paths):
+        """Issue read-ahead for the next `depth` upcoming paths"""
+        for path in paths[:self.depth]:
+            with self.lock:
+                if path in self.issued:
+                    continue
+                self.issued.add(path)
+            if self.use_fadvise:
+                self._advise(path)
+            else:
+                try:
+                    self.pending.put_nowait(path)
+                except Full:
+                    with self.lock:
+                        self.issued.discard(path)
+                        
+    def _advise(self, path):
+        """Ask the kernel to start reading the whole file"""
+        try:
+            fd = os.open(path, os.O_RDONLY)
+            try:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+            finally:
+                os.close(fd)
+        except OSError:
+            pass
+            
+    def _buffer_worker(self):
+        """Read upcoming files into the buffer pool, or warm their head and trailer"""
+        while True:
+            path = self.pending.get()
+            try:
+                size = os.path.getsize(path)
+                with self.lock:
+                    reserved = self.buffered_bytes + size <= self.buffer_bytes
+                    if reserved:
+                        self.buffered_bytes += size
+                        
+                data = None
+                with self.io_scheduler.slot(path):
+                    with open(path, "rb") as f:
+                        if reserved:
+                            data = f.read()
+                        else:
+                            # PdfReader starts at the trailer, so warm both ends
+                            f.read(PREFETCH_CHUNK_BYTES)
+                            f.seek(max(0, size - PREFETCH_CHUNK_BYTES))
+                            f.read()
+                            
+                if reserved:
+                    with self.lock:
+                        # Keep the data only if nobody consumed the file meanwhile
+                        if path in self.issued and path not in self.buffers:
+                            self.buffers[path] = data
+                            self.buffered_bytes += len(data) - size
+                        else:
+                            self.buffered_bytes -= size
+            except OSError:
+                with self.lock:
+                    self.issued.discard(path)
                     
-        return (correct_count / len(self.correct_paths)) * 100
+    def read(self, path):
+        """Return a file's bytes, from the buffer pool when it was prefetched"""
+        with self.lock:
+            self.issued.discard(path)
+            data = self.buffers.pop(path, None)
+            if data is not None:
+                self.buffered_bytes -= len(data)
+                return data
+                
+        start = time.perf_counter()
+        with self.io_scheduler.slot(path):
+            with open(path, "rb") as f:
+                data = f.read()
+        self._update(read_time=time.perf_counter() - start)
+        return data
+        
+    def discard(self, path):
+        """Forget a file that will not be read, releasing any buffer held for it"""
+        with self.lock:
+            self.issued.discard(path)
+            data = self.buffers.pop(path, None)
+            if data is not None:
+                self.buffered_bytes -= len(data)
+                
+    def record_parse(self, seconds):
+        """Record how long parsing one file took"""
+        self._update(parse_time=seconds)
+        
+    def _update(self, read_time=None, parse_time=None):
+        """Fold a new sample into the averages and step the depth toward the target"""
+        with self.lock:
+            if read_time is not None:
+                self.read_time = read_time if not self.read_time else 0.8 * self.read_time + 0.2 * read_time
+            if parse_time is not None:
+                self.parse_time = parse_time if not self.parse_time else 0.8 * self.parse_time + 0.2 * parse_time
+            if not self.parse_time:
+                return
+            # Enough files in flight to hide one read behind the parses ahead of it
+            target = min(self.max_depth, max(1, math.ceil(self.read_time / self.parse_time) + 1))
+            if target > self.depth:
+                self.depth += 1
+            elif target < self.depth - 1:
+                self.depth -= 1
+
+class WorkItem:
+    """A pending file with its estimated processing cost"""
+    # Every file in the root is queued up front, so items carry no per-instance dict
+    # and keep only what ordering needs; the name is derived from the path on use
+    __slots__ = ("path", "size", "source", "member", "data", "lane", "enqueued_at", "priority", "job",
+                 "label", "stat")
+    
+    def __init__(self, path, size, pages=None, source=None, member=None, data=None, bucketed=False):
+        self.path = path
+        self.size = size
+        
+        # Archive members carry their bundle, member name and, for tar, their bytes
+        self.source = source
+        self.member = member
+        self.data = data
+        
+        # In a batch, the root the file belongs to; from a manifest, a category hint and listed stat
+        self.job = None
+        self.label = None
+        self.stat = None
+        cost = size + (pages or 0) * SJF_PAGE_COST_BYTES
+        if bucketed:
+            # Equal costs fall back to queueing order, which on rotational disks is inode order
+            cost = cost_bucket(cost)
+        self.lane = "fast" if size <= SJF_FAST_LANE_BYTES else "main"
+        self.enqueued_at = time.monotonic()
+        
+        # Ordering by cost plus enqueue time is the same as cost minus time waited
+        self.priority = cost + SJF_AGING_BYTES_PER_SECOND * self.enqueued_at
+        
+    @property
+    def name(self):
+        return os.path.basename(self.path)
+
+def cost_bucket(cost):
+    """Round a cost up to a power of two, so files of similar cost compare equal"""
+    return 1 << max(0, cost - 1).bit_length()
+
+def estimate_page_count(path, size):
+    """Read the page count from the linearization dictionary or the file tail"""
+    try:
+        with open(path, "rb") as f:
+            match = LINEARIZED_PAGES_PATTERN.search(f.read(1024))
+            if match:
+                return int(match.group(1))
+            f.seek(max(0, size - SJF_TAIL_BYTES))
+            counts = [int(count) for count in PAGE_COUNT_PATTERN.findall(f.read())]
+            # The root of the page tree carries the largest /Count
+            return max(counts) if counts else None
+    except OSError:
+        return None
+
+class ByteBudget:
+    """Caps the bytes of archive members held in memory between reading and placing"""
+    def __init__(self, limit):
+        self.limit = limit
+        self.used = 0
+        self.condition = threading.Condition()
+        
+    def acquire(self, size):
+        """Wait until size bytes fit; a single oversized member is let through alone"""
+        with self.condition:
+            while self.used and self.used + size > self.limit:
+                self.condition.wait()
+            self.used += size
+            
+    def release(self, size):
+        """Return size bytes to the budget"""
+        with self.condition:
+            self.used -= size
+            self.condition.notify_all()
+
+class ArchiveSource:
+    """A zip or tar bundle scanned as a virtual directory of PDFs"""
+    def __init__(self, path, io_scheduler, budget, release=None):
+        self.path = path
+        self.io_scheduler = io_scheduler
+        self.budget = budget
+        self.release = release
+        self.lock = threading.Lock()
+        self.zip_file = None
+        
+        # The bundle is removed only once every member is placed and nothing else was in it
+        self.only_pdfs = True
+        self.listed = False
+        self.pending = 0
+        self.failed = 0
+        
+    def items(self):
+        """Yield a WorkItem for every PDF member"""
+        if self.path.lower().endswith(".zip"):
+            yield from self._zip_items()
+        else:
+            yield from self._tar_items()
+        with self.lock:
+            self.listed = True
+        self._close_if_done()
+        
+    def _zip_items(self):
+        """Zip members are read on demand, so only the directory is loaded here"""
+        import zipfile
+        self.zip_file = zipfile.ZipFile(self.path)
+        for info in self.zip_file.infolist():
+            if info.is_dir():
+                continue
+            if not info.filename.lower().endswith(".pdf"):
+                self.only_pdfs = False
+                continue
+            with self.lock:
+                self.pending += 1
+            yield WorkItem(f"{self.path}/{info.filename}", info.file_size, source=self, member=info.filename)
+            
+    def _tar_items(self):
+        """Tar members are streamed in order, so each is read now within the byte budget"""
+        import tarfile
+        with self.io_scheduler.slot(self.path):
+            tar_file = tarfile.open(self.path, mode="r|*")
+        with tar_file:
+            for member in tar_file:
+                if not member.isfile():
+                    continue
+                if not member.name.lower().endswith(".pdf"):
+                    self.only_pdfs = False
+                    continue
+                self.budget.acquire(member.size)
+                with self.io_scheduler.slot(self.path):
+                    data = tar_file.extractfile(member).read()
+                with self.lock:
+                    self.pending += 1
+                yield WorkItem(f"{self.path}/{member.name}", member.size, source=self,
+                               member=member.name, data=data)
+                
+    def read(self, item):
+        """Return a member's bytes without writing anything to disk"""
+        if item.data is not None:
+            data, item.data = item.data, None
+            self.budget.release(item.size)
+            return data
+        with self.io_scheduler.slot(self.path):
+            return self.zip_file.read(item.member)
+            
+    def finished(self, item, placed):
+        """Note that a member has been handled, removing the bundle after the last one"""
+        if item.data is not None:
+            item.data = None
+            self.budget.release(item.size)
+        with self.lock:
+            self.pending -= 1
+            if not placed:
+                self.failed += 1
+        self._close_if_done()
+        
+    def _close_if_done(self):
+        """Close the bundle once all members are handled, deleting it if all were placed"""
+        with self.lock:
+            if not self.listed or self.pending:
+                return
+            if self.zip_file:
+                self.zip_file.close()
+                self.zip_file = None
+            remove = self.only_pdfs and not self.failed
+            failed = self.failed
+            self.listed = False
+        if remove:
+            os.remove(self.path)
+        elif failed:
+            print(f"Archive {os.path.basename(self.path)}: {failed} members could not be placed, bundle kept")
+        if self.release:
+            self.release()
+
+def is_archive(file_name):
+    """Check whether a file name looks like a supported zip or tar bundle"""
+    return file_name.lower().endswith(ARCHIVE_SUFFIXES)
+
+class ClaimStore:
+    """Lease files in a shared folder that let several processes split one root folder
+    
+    A lease is created with link(), which is atomic on local filesystems and
+    NFS alike. Its holder refreshes the lease mtime on every heartbeat. A lease
+    that has not been refreshed for LEASE_TIMEOUT_SECONDS, measured on the file
+    server's clock, belongs to a crashed process. It is taken over by renaming
+    it away. The rename only counts if the renamed file is still the stale lease
+    that was inspected; otherwise another claimant won and the lease is put back.
+    
+    Every lease holds its creator's node id and a random token, and a node
+    only refreshes or removes leases that carry its own token.
+    """
+    def __init__(self, claims_folder, node_id, timeout=LEASE_TIMEOUT_SECONDS, heartbeat=LEASE_HEARTBEAT_SECONDS,
+                 spill=False):
+        self.claims_folder = claims_folder
+        self.node_id = node_id
+        self.timeout = timeout
+        self.heartbeat = heartbeat
+        os.makedirs(claims_folder, exist_ok=True)
+        
+        self.lock = threading.Lock()
+        self.held = {}
+        self.handled = FileTable(spill)
+        self.reclaimed = 0
+        self.clock_offset = 0.0
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self._heartbeat, name="ClaimHeartbeat", daemon=True)
+        
+    def start(self):
+        """Sync with the server clock and start refreshing held leases"""
+        self._sync_clock()
+        self.thread.start()
+        
+    def stop(self):
+        """Stop refreshing leases and remove the clock probe"""
+        self.stop_event.set()
+        self.thread.join()
+        self.handled.close()
+        try:
+            os.remove(os.path.join(self.claims_folder, f".clock.{self.node_id}"))
+        except FileNotFoundError:
+            pass
+        
+    def _lease_path(self, name):
+        return os.path.join(self.claims_folder, name + ".lease")
+        
+    def _sync_clock(self):
+        """Measure the offset between this host's clock and the file server's"""
+        probe = os.path.join(self.claims_folder, f".clock.{self.node_id}")
+        with open(probe, "w"):
+            pass
+        self.clock_offset = os.stat(probe).st_mtime - time.time()
+        
+    def _create(self, lease):
+        """Atomically create a lease, returning this node's token for it, or None if another node has it"""
+        token = f"{self.node_id} {os.urandom(8).hex()}"
+        temp_path = f"{lease}.{self.node_id}.tmp"
+        with open(temp_path, "w") as f:
+            f.write(token + "\n")
+        try:
+            try:
+                os.link(temp_path, lease)
+            except OSError:
+                pass
+            # On NFS a link can succeed yet report an error; the link count tells the truth
+            return token if os.stat(temp_path).st_nlink == 2 else None
+        finally:
+            os.remove(temp_path)
+            
+    def _token(self, lease):
+        """Return the token written in a lease, or None if it is gone"""
+        try:
+            with open(lease) as f:
+                return f.read().strip()
+        except FileNotFoundError:
+            return None
+            
+    def _age(self, lease):
+        """Seconds since a lease was last refreshed, on the file server's clock"""
+        return time.time() + self.clock_offset - os.stat(lease).st_mtime
+        
+    def acquire(self, name):
+        """Claim a file for this node; False if another live node holds it"""
+        lease = self._lease_path(name)
+        token = self._create(lease)
+        if token is None:
+            seen = self._token(lease)
+            try:
+                age = self._age(lease)
+            except FileNotFoundError:
+                return False
+            if seen is None or age < self.timeout:
+                return False
+                
+            # The holder stopped heartbeating; rename the lease away, then make sure the
+            # renamed file is the stale lease seen above and not a fresh one from a faster claimant
+            stale_path = f"{lease}.stale.{self.node_id}"
+            try:
+                os.rename(lease, stale_path)
+            except FileNotFoundError:
+                return False
+            if self._token(stale_path) != seen or self._age(stale_path) < self.timeout:
+                # Put the winner's lease back without replacing one created meanwhile
+                try:
+                    os.link(stale_path, lease)
+                except OSError:
+                    pass
+                os.remove(stale_path)
+                return False
+            os.remove(stale_path)
+            self.reclaimed += 1
+            token = self._create(lease)
+            if token is None:
+                return False
+                
+        with self.lock:
+            self.held[lease] = token
+        return True
+        
+    def release(self, name, handled=False):
+        """Give up a claim; handled files are not retried by this node's later sweeps"""
+        lease = self._lease_path(name)
+        with self.lock:
+            token = self.held.pop(lease, None)
+            if handled:
+                self.handled.add(name)
+        # A lease this node no longer owns belongs to another node and is left alone
+        if token is not None and self._token(lease) == token:
+            try:
+                os.remove(lease)
+            except FileNotFoundError:
+                pass
+                
+    def is_live(self, name):
+        """Check whether some node holds a fresh lease on a file"""
+        try:
+            age = self._age(self._lease_path(name))
+        except FileNotFoundError:
+            return False
+        return age < self.timeout
+        
+    def _heartbeat(self):
+        """Refresh the mtime of every held lease so other nodes see this one is alive"""
+        while not self.stop_event.wait(self.heartbeat):
+            self._sync_clock()
+            with self.lock:
+                leases = list(self.held.items())
+            for lease, token in leases:
+                if self._token(lease) != token:
+                    continue
+                try:
+                    os.utime(lease)
+                except FileNotFoundError:
+                    pass
+
+class WorkQueue:
+    """Shared shortest-job-first queue of pending files, with a fast lane for small ones"""
+    def __init__(self):
+        self.lanes = {"fast": [], "main": []}
+        self.sequence = itertools.count()
+        self.condition = threading.Condition()
+        self.closed = False
+        self.unfinished = 0
+        self.queued = 0
+        
+    def put(self, item):
+        """Add a WorkItem to its lane"""
+        with self.condition:
+            heapq.heappush(self.lanes[item.lane], (item.priority, next(self.sequence), item))
+            self.unfinished += 1
+            self.queued += 1
+            self.condition.notify_all()
+            
+    def task_done(self):
+        """Mark a file taken with get() as fully handled"""
+        with self.condition:
+            self.unfinished -= 1
+            if not self.unfinished:
+                self.condition.notify_all()
+                
+    def wait_idle(self):
+        """Wait until every queued file has been taken and handled"""
+        with self.condition:
+            while self.unfinished:
+                self.condition.wait()
+            
+    def close(self):
+        """Signal that no more files will be added"""
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+            
+    def get(self, lane="main"):
+        """Take the cheapest file for a lane, or None once the queue is closed and empty
+        
+        Fast-lane workers only take small files; main workers help the fast
+        lane when they have nothing else to do.
+        """
+        order = ("fast",) if lane == "fast" else ("main", "fast")
+        with self.condition:
+            while True:
+                for name in order:
+                    if self.lanes[name]:
+                        return heapq.heappop(self.lanes[name])[2]
+                if self.closed:
+                    return None
+                self.condition.wait()
+                
+    def peek(self, lane, count):
+        """Return up to count upcoming files of a lane without removing them"""
+        with self.condition:
+            heap = self.lanes[lane]
+            # The smallest count entries of a heap sit in its first 2**count - 1 slots
+            entries = heapq.nsmallest(count, heap[:2 ** count - 1])
+            return [entry[2] for entry in entries]
+            
+    def __len__(self):
+        return sum(len(heap) for heap in self.lanes.values())
+
+class WorkerPool:
+    """Worker threads pulling files from a WorkQueue, resizable while running"""
+    def __init__(self, work_queue, handler, lane="main"):
+        self.work_queue = work_queue
+        self.handler = handler
+        self.lane = lane
+        self.lock = threading.Lock()
+        self.threads = []
+        self.target = 0
+        self.live = 0
+        
+        # Each worker writes only its own slot, so counting needs no lock
+        self.completed_by_worker = {}
+        
+    @property
+    def completed(self):
+        """Files finished by all workers so far"""
+        return sum(list(self.completed_by_worker.values()))
+        
+    def resize(self, size):
+        """Grow to size workers now; extra workers retire after their current file"""
+        with self.lock:
+            self.target = size
+            while self.live < self.target:
+                self.live += 1
+                thread = threading.Thread(target=self._worker,
+                                          name=f"{self.lane.title()}-Worker-{len(self.threads) + 1}")
+                self.threads.append(thread)
+                thread.start()
+                
+    def _worker(self):
+        """Process files until the queue is drained or the pool shrinks"""
+        name = threading.current_thread().name
+        completed = 0
+        while True:
+            # Only take the lock when the pool may actually be shrinking
+            if self.live > self.target:
+                with self.lock:
+                    if self.live > self.target:
+                        self.live -= 1
+                        return
+            item = self.work_queue.get(self.lane)
+            if item is None:
+                with self.lock:
+                    self.live -= 1
+                return
+            try:
+                self.handler(item)
+            finally:
+                self.work_queue.task_done()
+            completed += 1
+            self.completed_by_worker[name] = completed
+                
+    def join(self):
+        """Wait for every worker, including ones started while waiting"""
+        while True:
+            with self.lock:
+                running = [thread for thread in self.threads if thread.is_alive()]
+            if not running:
+                return
+            for thread in running:
+                thread.join()
+
+class PoolController:
+    """Samples throughput and CPU use and steers the pool toward maximum files/sec"""
+    def __init__(self, pool, work_queue, min_workers=POOL_MIN_WORKERS, max_workers=POOL_MAX_WORKERS,
+                 interval=POOL_SAMPLE_SECONDS):
+        self.pool = pool
+        self.work_queue = work_queue
+        self.min_workers = min_workers
+        self.max_workers = max_workers
+        self.interval = interval
+        self.workers = min_workers
+        self.direction = 1
+        self.last_rate = None
+        self.decisions = []
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self._run, name="PoolController", daemon=True)
+        
+    def start(self):
+        """Start the floor number of workers and begin sampling"""
+        self.start_time = time.time()
+        self.pool.resize(self.workers)
+        self._log(0.0, 0.0, self.workers, "start at floor")
+        self.thread.start()
+        
+    def stop(self):
+        """Stop sampling"""
+        self.stop_event.set()
+        self.thread.join()
+        
+    def _run(self):
+        """Sample every interval and adjust the number of workers"""
+        cpu_count = os.cpu_count() or 1
+        last_time = time.time()
+        last_cpu = time.process_time()
+        last_completed = self.pool.completed
+        
+        while not self.stop_event.wait(self.interval):
+            now = time.time()
+            cpu = time.process_time()
+            completed = self.pool.completed
+            elapsed = max(now - last_time, 1e-6)
+            rate = (completed - last_completed) / elapsed
+            cpu_use = (cpu - last_cpu) / elapsed / cpu_count
+            last_time, last_cpu, last_completed = now, cpu, completed
+            
+            self._decide(rate, cpu_use)
+            
+    def _decide(self, rate, cpu_use):
+        """Hill-climb on files/sec: keep stepping while it improves, turn back when it drops"""
+        if not len(self.work_queue):
+            reason = "queue empty, hold"
+            self.direction = 0
+        elif self.last_rate is None:
+            reason = "first sample, grow"
+            self.direction = 1
+        elif rate > self.last_rate * (1 + POOL_TOLERANCE):
+            reason = "throughput up, continue"
+        elif rate < self.last_rate * (1 - POOL_TOLERANCE):
+            reason = "throughput down, reverse"
+            self.direction = -self.direction
+        elif cpu_use >= POOL_CPU_BUSY:
+            reason = "flat and CPU bound, shrink"
+            self.direction = -1
+        else:
+            reason = "flat, hold"
+            self.direction = 0
+            
+        workers = min(self.max_workers, max(self.min_workers, self.workers + self.direction))
+        self.direction = self.direction or 1
+        self.last_rate = rate
+        if workers != self.workers:
+            self.workers = workers
+            self.pool.resize(workers)
+        self._log(rate, cpu_use, workers, reason)
+        
+    def _log(self, rate, cpu_use, workers, reason):
+        """Record a decision for the end-of-run log"""
+        self.decisions.append(
+            f"{time.time() - self.start_time:7.1f}s  workers={workers:3}  "
+            f"rate={rate:8.1f} files/s  queue={len(self.work_queue):6}  cpu={cpu_use:5.0%}  {reason}"
+        )
+
+class LatencyHistogram:
+    """Fixed-size log-scale histogram of latencies, so memory does not grow with files"""
+    def __init__(self):
+        self.buckets = {}
+        self.count = 0
+        
+    def add(self, seconds):
+        """Count one latency sample"""
+        bucket = int(4 * math.log2(1 + seconds * 1000))
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.count += 1
+        
+    def merge(self, other):
+        """Add another histogram's samples to this one"""
+        for bucket, count in other.buckets.items():
+            self.buckets[bucket] = self.buckets.get(bucket, 0) + count
+        self.count += other.count
+        
+    def median(self):
+        """Approximate median in seconds, from the middle of its bucket"""
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen * 2 >= self.count:
+                return (2 ** ((bucket + 0.5) / 4) - 1) / 1000
+        return 0.0
+
+class FileTable:
+    """Compact, thread-safe map of file names to labels for runs over millions of files
+    
+    Names are kept as UTF-8 in one growing buffer, or in a temporary file when
+    spilled, and labels as interned 16-bit IDs in a parallel column. Lookups
+    go through an open-addressing index of file IDs. A tracked file costs its
+    name's bytes plus about 50 bytes, instead of a dict entry and two string objects.
+    """
+    def __init__(self, spill=False):
+        self.lock = threading.Lock()
+        self.labels = []
+        self.label_ids = {}
+        
+        # Parallel columns indexed by file ID; offsets[i]:offsets[i + 1] spans name i
+        self.offsets = array("Q", [0])
+        self.hashes = array("q")
+        self.label_column = array("H")
+        self.slots = array("q", [-1]) * 1024
+        
+        if spill:
+            import tempfile
+            self.spill = tempfile.TemporaryFile(buffering=0)
+            self.names = None
+        else:
+            self.spill = None
+            self.names = bytearray()
+            
+    def __len__(self):
+        return len(self.label_column)
+        
+    def __contains__(self, name):
+        return self.get(name, self) is not self
+        
+    def _name(self, file_id):
+        """Return the encoded name of a file ID"""
+        start, end = self.offsets[file_id], self.offsets[file_id + 1]
+        if self.spill is None:
+            return self.names[start:end]
+        self.spill.seek(start)
+        return self.spill.read(end - start)
+        
+    def _find(self, encoded, name_hash):
+        """Return the index slot holding a name, or the empty slot where it belongs"""
+        mask = len(self.slots) - 1
+        index = name_hash & mask
+        while True:
+            file_id = self.slots[index]
+            if file_id < 0 or (self.hashes[file_id] == name_hash and self._name(file_id) == encoded):
+                return index
+            index = (index + 1) & mask
+            
+    def _grow(self):
+        """Double the index, reinserting file IDs by their stored hashes"""
+        self.slots = array("q", [-1]) * (len(self.slots) * 2)
+        mask = len(self.slots) - 1
+        for file_id, name_hash in enumerate(self.hashes):
+            index = name_hash & mask
+            while self.slots[index] >= 0:
+                index = (index + 1) & mask
+            self.slots[index] = file_id
+            
+    def _add(self, name, label):
+        """Record one file; the caller holds the lock"""
+        label_id = self.label_ids.get(label)
+        if label_id is None:
+            label_id = self.label_ids[label] = len(self.labels)
+            self.labels.append(label)
+            
+        encoded = name.encode("utf-8", "surrogateescape")
+        name_hash = hash(encoded)
+        index = self._find(encoded, name_hash)
+        file_id = self.slots[index]
+        if file_id >= 0:
+            self.label_column[file_id] = label_id
+            return
+            
+        if self.spill is None:
+            self.names += encoded
+        else:
+            self.spill.seek(self.offsets[-1])
+            self.spill.write(encoded)
+        self.offsets.append(self.offsets[-1] + len(encoded))
+        self.hashes.append(name_hash)
+        self.label_column.append(label_id)
+        self.slots[index] = len(self.label_column) - 1
+        
+        # Keep the index at most half full so probes stay short
+        if len(self.label_column) * 2 > len(self.slots):
+            self._grow()
+            
+    def add(self, name, label=None):
+        """Record a file under a label, replacing any earlier label"""
+        with self.lock:
+            self._add(name, label)
+            
+    def add_many(self, records):
+        """Record a batch of (name, label) pairs under one lock"""
+        with self.lock:
+            for name, label in records:
+                self._add(name, label)
+                
+    def get(self, name, default=None):
+        """Return a file's label, or default if it is not tracked"""
+        encoded = name.encode("utf-8", "surrogateescape")
+        with self.lock:
+            file_id = self.slots[self._find(encoded, hash(encoded))]
+            return self.labels[self.label_column[file_id]] if file_id >= 0 else default
+            
+    def close(self):
+        """Remove the spill file, if any"""
+        if self.spill is not None:
+            self.spill.close()
+
+class WorkerStats:
+    """Counters and buffered move records owned by a single worker thread"""
+    def __init__(self, categories):
+        self.file_counts = empty_counts(categories)
+        self.placements = LatencyHistogram()
+        self.pending_moves = []
+        self.pending_files = []
+        
+        # Progress counters; only the owning worker writes them
+        self.classified = 0
+        self.moved = 0
+        self.failed = 0
+        self.missing = 0
+        self.handled_bytes = 0
 
 class ThreadSafeFileMover:
     """Handles thread-safe file operations and tracking"""
-    def __init__(self):
-        # Initialize locks for thread safety
-        self.file_lock = threading.Lock()
-        self.counts_lock = threading.Lock()
-        self.processed_files_lock = threading.Lock()
-        self.file_locations_lock = threading.Lock()
-        
-        # Initialize tracking containers
-        self.file_counts = {}
-        self.processed_files = set()
-        self.file_locations = {}
-        
-    def is_processed(self, file_name):
-        """Check if a file has been processed"""
-        with self.processed_files_lock:
-            return file_name in self.processed_files
-            
-    def mark_processed(self, file_name):
-        """Mark a file as processed"""
-        with self.processed_files_lock:
-            self.processed_files.add(file_name)
+    def __init__(self, categories, move_log_path, io_scheduler=None, spill=False, prefetcher=None,
+                 track_files=False):
+        # Per-device I/O limits replace a single global file lock
+        self.io_scheduler = io_scheduler or IOScheduler()
+        self.prefetcher = prefetcher or Prefetcher(self.io_scheduler)
+        self.categories = categories
+        
+        # Each worker keeps its own counters; the lock is only taken when a worker registers
+        self.local = threading.local()
+        self.stats_lock = threading.Lock()
+        self.worker_stats = []
+        
+        # Moves are streamed to disk as NDJSON, one batch per lock
+        self.move_log_path = move_log_path
+        self.move_log_lock = threading.Lock()
+        self.move_log = open(move_log_path, "w", encoding="utf-8")
+        
+        # Where each moved file went, kept compact for scoring against labels after the run;
+        # without labels nothing is kept per file, so memory stays flat however many files move
+        self.file_table = FileTable(spill) if track_files else None
+        
+    def stats(self):
+        """Return the calling worker's own stats, creating them on first use"""
+        stats = getattr(self.local, "stats", None)
+        if stats is None:
+            stats = WorkerStats(self.categories)
+            self.local.stats = stats
+            with self.stats_lock:
+                self.worker_stats.append(stats)
+        return stats
             
+    def _place(self, source, destination):
+        """Give source the name destination, raising FileExistsError rather than overwriting
+        
+        A hard link fails atomically when the name is taken; filesystems
+        without hard links fall back to a check before the rename. A
+        destination on another filesystem gets a copy, then the source is removed.
+        """
+        try:
+            os.link(source, destination)
+        except FileExistsError:
+            raise
+        except OSError as e:
+            if e.errno == errno.EXDEV:
+                self._place_copy(source, destination)
+                return
+            if os.path.exists(destination):
+                raise FileExistsError(destination)
+            try:
+                os.rename(source, destination)
+            except OSError as e:
+                if e.errno != errno.EXDEV:
+                    raise
+                self._place_copy(source, destination)
+            return
+        os.remove(source)
+        
+    def _place_copy(self, source, destination):
+        """Copy source next to destination, place the copy there, then remove source"""
+        import shutil
+        folder, name = os.path.split(destination)
+        partial_path = os.path.join(folder, f".{name}.{os.urandom(6).hex()}.part")
+        try:
+            # copy2 keeps the mtime, so text cache keys still match the placed file
+            shutil.copy2(source, partial_path)
+            self._place(partial_path, destination)
+        except BaseException:
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+            raise
+        os.remove(source)
+        
     def move_file(self, source, destination):
-        """Thread-safe file moving operation"""
-        with self.file_lock:
-            os.rename(source, destination)
-            self.record_file_location(os.path.basename(source), 
-                                    os.path.dirname(destination).split(os.path.sep)[-1])
+        """Thread-safe file moving operation; an existing destination is never overwritten"""
+        with self.io_scheduler.slot(source):
+            self._place(source, destination)
+            
+    def write_file(self, data, destination):
+        """Write an archive member straight to its destination, the only copy made
+        
+        Each write goes to its own temporary file, so members that share a
+        name cannot interleave, and an existing destination is never overwritten.
+        """
+        folder, name = os.path.split(destination)
+        partial_path = os.path.join(folder, f".{name}.{os.urandom(6).hex()}.part")
+        with self.io_scheduler.slot(destination):
+            try:
+                with open(partial_path, "xb") as f:
+                    f.write(data)
+                self._place(partial_path, destination)
+            except BaseException:
+                if os.path.exists(partial_path):
+                    os.remove(partial_path)
+                raise
             
     def update_counts(self, main_cat, sub_cat=None):
-        """Update file counts for categories"""
-        with self.counts_lock:
-            if sub_cat:
-                self.file_counts[main_cat][sub_cat] += 1
-            else:
-                self.file_counts[main_cat] += 1
+        """Update the calling worker's file counts for categories"""
+        file_counts = self.stats().file_counts
+        if sub_cat:
+            file_counts[main_cat][sub_cat] += 1
+        else:
+            file_counts[main_cat] += 1
+            
+    def record_move(self, file_name, destination, category, placed_after):
+        """Buffer a move record, writing the worker's buffer out once it is full"""
+        stats = self.stats()
+        stats.placements.add(placed_after)
+        if self.file_table is not None:
+            stats.pending_files.append((file_name, category))
+        stats.pending_moves.append(json.dumps({
+            "file": file_name,
+            "category": category,
+            "destination": destination,
+            "placed_after": round(placed_after, 4),
+        }, ensure_ascii=False))
+        if len(stats.pending_moves) >= MOVE_LOG_BATCH:
+            self._flush(stats)
+            
+    def _flush(self, stats):
+        """Write a worker's buffered move records to the move log"""
+        if not stats.pending_moves:
+            return
+        lines = "\n".join(stats.pending_moves) + "\n"
+        if stats.pending_files:
+            self.file_table.add_many(stats.pending_files)
+            stats.pending_files = []
+        stats.pending_moves = []
+        with self.move_log_lock:
+            self.move_log.write(lines)
             
-    def record_file_location(self, filename, destination):
-        """Record where each file is moved"""
-        with self.file_locations_lock:
-            self.file_locations[filename] = destination
+    def close(self):
+        """Flush every worker's remaining records and close the move log"""
+        with self.stats_lock:
+            for stats in self.worker_stats:
+                self._flush(stats)
+        self.move_log.close()
+        
+    def merged_counts(self):
+        """Sum the file counts of every worker"""
+        file_counts = empty_counts(self.categories)
+        with self.stats_lock:
+            for stats in self.worker_stats:
+                for main_cat, counts in stats.file_counts.items():
+                    if isinstance(counts, dict):
+                        for sub_cat, count in counts.items():
+                            file_counts[main_cat][sub_cat] += count
+                    else:
+                        file_counts[main_cat] += counts
+        return file_counts
+        
+    def merged_placements(self):
+        """Combine the time-to-placement histograms of every worker"""
+        placements = LatencyHistogram()
+        with self.stats_lock:
+            for stats in self.worker_stats:
+                placements.merge(stats.placements)
+        return placements
 
-def create_folder_structure(root_folder):
-    """Create the folder structure and return category definitions"""
-    # Define the multilevel folder structure
-    folder_structure = {
-        "Programming": {"Python": [], "Java": [], "C": [] },
-        "AI": {"Machine_Learning": [], "Neural_Networks": [] },
-        "Math": {"Linear_Algebra": [], "Calculus": [] },
-        "Database": {"SQL": [], "NoSQL": [] },
-        "Security": {"Cryptography": [], "Network_Security": [] },
-        "Others": [] 
-    }
+def format_duration(seconds):
+    """Format seconds as H:MM:SS"""
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02}:{seconds:02}"
 
-    # Define keywords for each subcategory
+class ProgressReporter:
+    """Samples the run's counters on a background thread and reports progress, throughput and ETA
+    
+    Workers only bump counters in their own WorkerStats, and this thread
+    reads them without locks, so the hot path never waits on reporting. On
+    a terminal a status line is redrawn in place; otherwise a JSON line is
+    written every interval.
+    """
+    def __init__(self, work_queue, file_movers, mode="auto", stream=None, interval=None):
+        self.work_queue = work_queue
+        self.file_movers = file_movers
+        self.stream = stream or sys.stderr
+        if mode == "auto":
+            mode = "tty" if self.stream.isatty() else "json"
+        self.mode = mode
+        self.interval = interval or (PROGRESS_TTY_SECONDS if mode == "tty" else PROGRESS_JSON_SECONDS)
+        
+        # Recent (time, files done, bytes done) samples for rolling rates, starting from zero
+        self.start_time = time.monotonic()
+        self.samples = deque([(self.start_time, 0, 0)])
+        self.sampling_time = 0.0
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self._run, name="Progress", daemon=True)
+        
+    def start(self):
+        self.thread.start()
+        
+    def stop(self):
+        """Stop sampling and write a final report"""
+        self.stop_event.set()
+        self.thread.join()
+        self._report(final=True)
+        
+    def sample(self):
+        """Read the counters and derive rolling rates and the ETA"""
+        totals = {"classified": 0, "moved": 0, "failed": 0, "handled_bytes": 0}
+        for file_mover in self.file_movers:
+            for stats in list(file_mover.worker_stats):
+                totals["classified"] += stats.classified
+                totals["moved"] += stats.moved
+                totals["failed"] += stats.failed
+                totals["handled_bytes"] += stats.handled_bytes
+                
+        # The queue's counters are read without its lock. put() raises unfinished before
+        # queued, so reading queued first can only undercount done, never exceed scanned
+        scanning = not self.work_queue.closed
+        scanned = self.work_queue.queued
+        remaining = self.work_queue.unfinished
+        done = max(0, scanned - remaining)
+        
+        now = time.monotonic()
+        self.samples.append((now, done, totals["handled_bytes"]))
+        while len(self.samples) > 2 and now - self.samples[1][0] >= PROGRESS_WINDOW_SECONDS:
+            self.samples.popleft()
+        first_time, first_done, first_bytes = self.samples[0]
+        window = now - first_time
+        files_per_second = (done - first_done) / window if window else 0.0
+        bytes_per_second = (totals["handled_bytes"] - first_bytes) / window if window else 0.0
+        
+        # Until scanning ends the total is unknown, so there is no ETA yet
+        eta = remaining / files_per_second if files_per_second and not scanning else None
+        return {"elapsed": round(now - self.start_time, 1), "scanned": scanned, "done": done,
+                "classified": totals["classified"], "moved": totals["moved"], "failed": totals["failed"],
+                "files_per_second": round(files_per_second, 1), "mb_per_second": round(bytes_per_second / 1e6, 2),
+                "eta_seconds": round(eta) if eta is not None else None, "scanning": scanning}
+                
+    def _report(self, final=False):
+        start = time.perf_counter()
+        progress = self.sample()
+        if self.mode == "json":
+            if final:
+                progress["final"] = True
+            self.stream.write(json.dumps(progress) + "\n")
+        else:
+            eta = format_duration(progress["eta_seconds"]) if progress["eta_seconds"] is not None else "--"
+            line = (f"{progress['scanned']} scanned | {progress['classified']} classified | "
+                    f"{progress['moved']} moved | {progress['failed']} failed | "
+                    f"{progress['files_per_second']:.1f} files/s | {progress['mb_per_second']:.1f} MB/s | ETA {eta}")
+            # Clear to the end of the line so a shorter line leaves no leftovers
+            self.stream.write("\r" + line + "\033[K" + ("\n" if final else ""))
+        self.stream.flush()
+        self.sampling_time += time.perf_counter() - start
+        
+    def _run(self):
+        while not self.stop_event.wait(self.interval):
+            self._report()
+            
+    def overhead(self):
+        """Fraction of the run's wall time spent sampling and rendering"""
+        elapsed = time.monotonic() - self.start_time
+        return self.sampling_time / elapsed if elapsed else 0.0
+
+def profiled_extract(extractor, pdf_bytes):
+    """Run an extractor under cProfile in a worker process, returning (text, raw stats)"""
+    import cProfile
+    profile = cProfile.Profile()
+    text = profile.runcall(extractor, pdf_bytes)
+    profile.create_stats()
+    return text, profile.stats
+
+class _RawStats:
+    """Lets pstats load a stats dict sent back from a worker process"""
+    def __init__(self, stats):
+        self.stats = stats
+        
+    def create_stats(self):
+        pass
+
+class RunProfiler:
+    """Profiles the worker hot path of every Nth file and merges the results into one pstats file
+    
+    cProfile only sees the thread it was enabled in, so each worker keeps its
+    own profile; extraction done in worker processes is profiled there and its
+    stats come back with the text. On Python 3.12+ only one thread can profile
+    at a time, so a file that would overlap another is left unprofiled.
+    
+    The tracemalloc mode clears the traces at each stage boundary of a
+    sampled file (extraction, scoring, moving), so a snapshot holds only the
+    stage's surviving allocations, and sums them per allocation site. Tracing
+    is on only while a sampled file is in flight, so other files run untraced
+    unless they overlap one. Other workers allocate meanwhile, and overlapping
+    sampled files clear each other's traces, so the sums are indicative only.
+    A snapshot still pauses every worker while it is grouped, so this mode is
+    for diagnosis with a large --profile-sample, not production runs.
+    """
+    def __init__(self, profile_path=None, trace_memory=False, sample_every=1):
+        self.profile_path = profile_path
+        self.trace_memory = trace_memory
+        self.sample_every = max(1, sample_every)
+        self.counter = itertools.count()
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.profiles = []
+        self.process_stats = []
+        self.allocations = {}
+        self.sampled = 0
+        self.tracing = 0
+        if trace_memory:
+            # Sites inside tracemalloc and the import machinery are left out of the report
+            import tracemalloc
+            self.ignored_files = (tracemalloc.__file__, "<frozen importlib._bootstrap")
+            
+    def _trace(self, change):
+        """Count sampled files in flight, tracing allocations only while there are any"""
+        import tracemalloc
+        with self.lock:
+            self.tracing += change
+            if change > 0 and self.tracing == 1:
+                tracemalloc.start()
+            elif change < 0 and not self.tracing:
+                tracemalloc.stop()
+                
+    def active(self):
+        """Whether the calling worker is handling a sampled file"""
+        return getattr(self.local, "active", False)
+        
+    def wrap(self, process_file):
+        """Return a handler that profiles every Nth file it is given"""
+        import cProfile
+        
+        def handler(item):
+            # The Nth, 2Nth, ... files are sampled, so a run shorter than N files is never slowed
+            if next(self.counter) % self.sample_every != self.sample_every - 1:
+                return process_file(item)
+            # Traces are cleared before profiling starts, to keep that out of the CPU profile
+            if self.trace_memory:
+                import tracemalloc
+                self._trace(1)
+                tracemalloc.clear_traces()
+            profile = None
+            if self.profile_path:
+                profile = getattr(self.local, "profile", None)
+                if profile is None:
+                    profile = self.local.profile = cProfile.Profile()
+                    with self.lock:
+                        self.profiles.append(profile)
+                try:
+                    profile.enable()
+                except ValueError:
+                    # Another thread is profiling (Python 3.12+)
+                    if self.trace_memory:
+                        self._trace(-1)
+                    return process_file(item)
+            self.local.active = True
+            try:
+                return process_file(item)
+            finally:
+                self.local.active = False
+                if profile:
+                    profile.disable()
+                if self.trace_memory:
+                    self._trace(-1)
+                with self.lock:
+                    self.sampled += 1
+                    
+        return handler
+        
+    def add_process_stats(self, stats):
+        """Keep the stats of an extraction profiled in a worker process"""
+        with self.lock:
+            self.process_stats.append(stats)
+            
+    def mark(self, stage):
+        """Attribute heap growth since the sampled file's previous mark to a stage"""
+        if not (self.trace_memory and self.active()):
+            return
+        import tracemalloc
+        # Keep the snapshot itself out of the CPU profile
+        profile = getattr(self.local, "profile", None)
+        if profile:
+            profile.disable()
+        # Only blocks allocated since the previous mark are traced, so what is left is the stage's growth
+        snapshot = tracemalloc.take_snapshot()
+        tracemalloc.clear_traces()
+        growth = snapshot.statistics("lineno")
+        with self.lock:
+            sites = self.allocations.setdefault(stage, {})
+            for statistic in growth:
+                if statistic.traceback[0].filename.startswith(self.ignored_files):
+                    continue
+                site = str(statistic.traceback[0])
+                sites[site] = sites.get(site, 0) + statistic.size
+        if profile:
+            profile.enable()
+            
+    def finish(self):
+        """Write the merged pstats file and show the top allocation sites per stage"""
+        print("\n" + "="*50)
+        print("               PROFILE")
+        print("="*50)
+        print(f"\nProfiled files: {self.sampled} (every {self.sample_every})")
+        if self.profile_path:
+            import pstats
+            sources = self.profiles + [_RawStats(stats) for stats in self.process_stats]
+            if sources:
+                pstats.Stats(*sources).dump_stats(self.profile_path)
+                print(f"CPU profile   : {self.profile_path} (python -m pstats {self.profile_path})")
+        if self.trace_memory:
+            for stage, sites in self.allocations.items():
+                print(f"\nTop allocation sites, {stage}:")
+                print("-" * 30)
+                for site, size in sorted(sites.items(), key=lambda entry: -entry[1])[:PROFILE_TOP_SITES]:
+                    print(f"{size / 1024:10.1f} KiB  {site}")
+
+def read_move_log(move_log_path):
+    """Stream the move records written by a run"""
+    with open(move_log_path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+def empty_counts(categories):
+    """Zeroed file counts shaped like the category definitions"""
+    return {main_cat: {sub_cat: 0 for sub_cat in sub_cats.keys()} if isinstance(sub_cats, dict) else 0
+            for main_cat, sub_cats in categories.items()}
+
+def define_categories():
+    """Return the keyword definitions for each category and subcategory"""
     categories = {
         "Programming": {
             "Python": ["python", "pip", "django", "flask", "pandas", "numpy"],
@@ -111,9 +1444,70 @@ def create_folder_structure(root_folder):
         },
         "Others": ["general topics", "miscellaneous", "varied interests"]
     }
+    return categories
 
-    # Create the physical folder structure
-    for main_category, subcategories in folder_structure.items():
+class TextCache:
+    """SQLite store of extracted first-page text, keyed by file name, size and mtime
+
+    The key survives a move into a category folder, so text extracted during a
+    run is reused when the same files are evaluated later.
+    """
+    def __init__(self, path, table="texts"):
+        import sqlite3
+        # Each extractor gets its own table, since their texts differ
+        self.table = table
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} (name TEXT, size INTEGER, mtime_ns INTEGER, text TEXT, "
+            "PRIMARY KEY (name, size, mtime_ns))")
+        self.lock = threading.Lock()
+        self.pending = []
+        
+    def get(self, path, stat_result):
+        """Return the cached text for a file, or None"""
+        key = (os.path.basename(path), stat_result.st_size, stat_result.st_mtime_ns)
+        with self.lock:
+            row = self.connection.execute(
+                f"SELECT text FROM {self.table} WHERE name = ? AND size = ? AND mtime_ns = ?", key).fetchone()
+        return row[0] if row else None
+        
+    def put(self, path, stat_result, text):
+        """Queue a file's text for storage, committing in batches"""
+        with self.lock:
+            self.pending.append((os.path.basename(path), stat_result.st_size, stat_result.st_mtime_ns, text))
+            if len(self.pending) >= TEXT_CACHE_BATCH:
+                self._flush()
+                
+    def _flush(self):
+        """Write queued texts; the caller holds the lock"""
+        if self.pending:
+            self.connection.executemany(f"INSERT OR REPLACE INTO {self.table} VALUES (?, ?, ?, ?)", self.pending)
+            self.connection.commit()
+            self.pending = []
+            
+    def close(self):
+        """Write any queued texts and close the store"""
+        with self.lock:
+            self._flush()
+            self.connection.close()
+
+def load_categories(categories_path=None):
+    """Load keyword definitions from a JSON file shaped like define_categories(), or the defaults"""
+    if not categories_path:
+        return define_categories()
+    with open(categories_path, encoding="utf-8") as f:
+        categories = json.load(f)
+    # Unmatched files always go to Others, so it needs a folder even when the file leaves it out
+    categories.setdefault("Others", [])
+    return categories
+
+def create_folder_structure(root_folder, categories=None):
+    """Create the folder structure and return category definitions"""
+    if categories is None:
+        categories = define_categories()
+
+    # Create the physical folder structure, one folder per category and subcategory
+    for main_category, subcategories in categories.items():
         main_path = os.path.join(root_folder, main_category)
         os.makedirs(main_path, exist_ok=True)
         
@@ -125,87 +1519,286 @@ def create_folder_structure(root_folder):
     print("Folder structure created successfully.")
     return categories
 
-def categorize_and_move_files(root_folder, categories, file_mover):
+def extract_text(pdf_bytes):
+    """Extract the lowercased first-page text of a PDF, or None if it has no pages"""
+    import PyPDF2
+    pdf_reader = PyPDF2.PdfReader(io.BytesIO(pdf_bytes))
+    if not pdf_reader.pages:
+        return None
+    return pdf_reader.pages[0].extract_text().lower()
+
+def _unescape_literal(match):
+    """Decode one backslash escape inside a PDF literal string"""
+    escape = match.group(1)
+    if escape[:1].isdigit():
+        return bytes([int(escape, 8) & 0xFF])
+    return LITERAL_ESCAPES.get(escape, escape)
+
+def _simple_font(font):
+    """Check whether a font's bytes map to characters through a standard encoding"""
+    font = font.get_object()
+    if font.get("/Subtype") in ("/Type0", "/Type3"):
+        return False
+    encoding = font.get("/Encoding")
+    if encoding is None:
+        # Without an encoding, subset fonts carry their own arbitrary byte mapping
+        base_font = font.get("/BaseFont")
+        return base_font is None or "+" not in str(base_font.get_object())
+    # An encoding dictionary remaps bytes through /Differences
+    encoding = encoding.get_object()
+    return isinstance(encoding, str) and encoding in STANDARD_ENCODINGS
+
+def scan_content_text(data):
+    """Collect the string operands of Tj, TJ, ' and " from a decoded content stream"""
+    if b"BI" in data:
+        # Inline image data is binary and must not be tokenized
+        data = INLINE_IMAGE_PATTERN.sub(b" ", data)
+    shown = []
+    operands = []
+    array = None
+    for match in CONTENT_TOKEN_PATTERN.finditer(data):
+        token = match.group()
+        first = token[:1]
+        if first == b"(":
+            value = LITERAL_ESCAPE_PATTERN.sub(_unescape_literal, token[1:-1])
+            (array if array is not None else operands).append(value)
+        elif first == b"<" and token != b"<<":
+            digits = bytes(c for c in token[1:-1] if c not in b" \t\r\n")
+            value = bytes.fromhex((digits + b"0" * (len(digits) % 2)).decode("ascii"))
+            (array if array is not None else operands).append(value)
+        elif token == b"[":
+            array = []
+        elif token == b"]":
+            operands.append(b"".join(array or []))
+            array = None
+        elif first in b"+-.0123456789":
+            # A large negative TJ adjustment is a gap between words
+            if array is not None and float(token) < -TJ_WORD_GAP:
+                array.append(b" ")
+        elif token in (b"Tj", b"TJ", b"'", b'"'):
+            if token != b"Tj" and token != b"TJ":
+                shown.append(b" ")
+            shown.extend(operands)
+            operands = []
+        else:
+            if token in TEXT_MOVE_OPERATORS:
+                shown.append(b" ")
+            operands = []
+    return b"".join(shown)
+
+def first_page(pdf_reader):
+    """Return the first page and its resources, walking the page tree down to the first leaf
+    
+    reader.pages flattens the whole page tree, resolving every page of the
+    document, which costs more than reading one page's text. Resources a
+    page does not define are inherited from the nearest ancestor that does.
+    Returns (None, None) for a document without pages.
+    """
+    node = pdf_reader.trailer["/Root"].get_object()["/Pages"].get_object()
+    resources = None
+    while True:
+        if "/Resources" in node:
+            resources = node["/Resources"]
+        if node.get("/Type") == "/Page" or "/Kids" not in node:
+            return node, resources
+        # Skip empty branches, which some writers leave in the tree
+        for kid in node["/Kids"]:
+            kid = kid.get_object()
+            if kid.get("/Type") == "/Page" or kid.get("/Count", 1) > 0:
+                node = kid
+                break
+        else:
+            return None, None
+
+def fast_page_text(page, resources=None, depth=0):
+    """Text of a page or form from its content streams, or None when the fonts need full decoding"""
+    if resources is None:
+        resources = page.get("/Resources")
+    resources = resources.get_object() if resources is not None else {}
+    
+    fonts = resources.get("/Font")
+    if fonts is not None and not all(_simple_font(font) for font in fonts.get_object().values()):
+        return None
+        
+    if depth:
+        data = page.get_data()
+    else:
+        # A page's contents are one stream or an array of streams drawn in order
+        contents = page.get("/Contents")
+        contents = contents.get_object() if contents is not None else []
+        if isinstance(contents, list):
+            data = b"\n".join(part.get_object().get_data() for part in contents)
+        else:
+            data = contents.get_data()
+    parts = [scan_content_text(data).decode("cp1252", errors="replace")]
+    
+    # Text inside form XObjects is drawn with the form's own resources
+    xobjects = resources.get("/XObject")
+    if xobjects is not None and depth < FORM_XOBJECT_DEPTH:
+        for xobject in xobjects.get_object().values():
+            xobject = xobject.get_object()
+            if xobject.get("/Subtype") == "/Form":
+                form_text = fast_page_text(xobject, xobject.get("/Resources", resources), depth + 1)
+                if form_text is None:
+                    return None
+                parts.append(form_text)
+                
+    return " ".join(" ".join(parts).lower().split())
+
+def extract_text_fast(pdf_bytes):
+    """Like extract_text, but reads the content stream directly, falling back when it cannot"""
+    import PyPDF2
+    pdf_reader = PyPDF2.PdfReader(io.BytesIO(pdf_bytes))
+    try:
+        page, resources = first_page(pdf_reader)
+        text = fast_page_text(page, resources) if page is not None else None
+    except Exception:
+        # Malformed content or page trees the scanner cannot read may still decode the full way
+        text = None
+    if not text:
+        if not pdf_reader.pages:
+            return None
+        return pdf_reader.pages[0].extract_text().lower()
+    return text
+
+def score_categories(text, file_name, categories):
+    """Return the best matching (main, sub) category, or ("Others", None)"""
+    file_name_lower = file_name.lower()
+    max_matches = 0
+    best_category = ("Others", None)
+    
+    # Earlier categories win ties, so the result does not depend on scheduling
+    for main_category, subcategories in categories.items():
+        if not isinstance(subcategories, dict):
+            continue
+        for sub_cat, keywords in subcategories.items():
+            matches = sum(1 for keyword in keywords if
+                       keyword in text or keyword in file_name_lower)
+            if matches > max_matches:
+                max_matches = matches
+                best_category = (main_category, sub_cat)
+                
+    return best_category
+
+def categorize_and_move_files(root_folder, categories, file_mover, work_queue, executor=None, text_cache=None,
+                              claims=None, extractor=extract_text, profiler=None):
     """Main file categorization logic"""
-    def process_category(main_category):
-        """Process files for a specific category"""
-        print(f"Thread started for category: {main_category}")
-        files = [f for f in os.listdir(root_folder) if f.endswith('.pdf')]
+    prefetcher = file_mover.prefetcher
+    
+    def process_file(item):
+        """Classify one queued file and move it into its category folder"""
+        file_path = item.path
+        file_name = item.name
+        placed = False
         
-        for file_name in files:
-            if file_mover.is_processed(file_name):
-                continue
+        # Under coordination, claim the file first; another node may have moved it meanwhile
+        claimed = claims is not None and not item.source
+        if claimed and not claims.acquire(file_name):
+            prefetcher.discard(file_path)
+            return
+        stats = file_mover.stats()
+        if not item.source and not os.path.exists(file_path):
+            prefetcher.discard(file_path)
+            if claimed:
+                claims.release(file_name)
+            else:
+                # Without coordination no other node moves files, so a queued file that is gone was never there
+                stats.missing += 1
+            return
+            
+        # Warm the next files in this lane while this one is parsed; hinted files are never read
+        upcoming = work_queue.peek(item.lane, prefetcher.max_depth)
+        prefetcher.prefetch([upcoming_item.path for upcoming_item in upcoming
+                             if not upcoming_item.source and not upcoming_item.label])
+        
+        try:
+            # Reuse text extracted by an earlier run; a plain file is then moved unread
+            stat_result = None
+            first_page_text = None
+            if text_cache and not item.source and not item.label:
+                stat_result = item.stat or os.stat(file_path)
+                first_page_text = text_cache.get(file_path, stat_result)
                 
-            file_path = os.path.join(root_folder, file_name)
-            if not os.path.exists(file_path):
-                continue
+            if first_page_text is None and not item.label:
+                # Read under the device limit, then parse from memory
+                if item.source:
+                    pdf_bytes = item.source.read(item)
+                else:
+                    pdf_bytes = prefetcher.read(file_path)
                 
-            try:
                 # Extract and analyze PDF content
-                with open(file_path, "rb") as f:
-                    pdf_reader = PyPDF2.PdfReader(f)
-                    if not pdf_reader.pages:
-                        continue
-                        
-                    first_page_text = pdf_reader.pages[0].extract_text().lower()
-                    file_name_lower = file_name.lower()
-                    
-                    # Categorize based on content matching
-                    if isinstance(categories[main_category], dict):
-                        max_matches = 0
-                        best_sub_cat = None
-                        
-                        # Find best matching subcategory
-                        for sub_cat, keywords in categories[main_category].items():
-                            matches = sum(1 for keyword in keywords if 
-                                       keyword in first_page_text or keyword in file_name_lower)
-                            if matches > max_matches:
-                                max_matches = matches
-                                best_sub_cat = sub_cat
-                        
-                        if max_matches > 0:
-                            # Move file to best matching category
-                            destination_folder = os.path.join(root_folder, main_category, best_sub_cat)
-                            destination_path = os.path.join(destination_folder, file_name)
-                            
-                            try:
-                                file_mover.move_file(file_path, destination_path)
-                                file_mover.update_counts(main_category, best_sub_cat)
-                                file_mover.mark_processed(file_name)
-                                # Log the move for later display
-                                with file_mover.processed_files_lock:
-                                    if not hasattr(file_mover, 'moves_log'):
-                                        file_mover.moves_log = []
-                                    file_mover.moves_log.append(
-                                        f"{file_name:30} → {main_category}/{best_sub_cat}"
-                                    )
-                            except FileNotFoundError:
-                                pass
-                    
-                    # Handle "Others" category
-                    elif main_category == "Others" and os.path.exists(file_path):
-                        if not any(file_mover.is_processed(file_name) for _ in range(100)):
-                            destination_folder = os.path.join(root_folder, "Others")
-                            destination_path = os.path.join(destination_folder, file_name)
-                            try:
-                                file_mover.move_file(file_path, destination_path)
-                                file_mover.update_counts("Others")
-                                file_mover.mark_processed(file_name)
-                                with file_mover.processed_files_lock:
-                                    if not hasattr(file_mover, 'moves_log'):
-                                        file_mover.moves_log = []
-                                    file_mover.moves_log.append(
-                                        f"{file_name:30} → Others"
-                                    )
-                            except FileNotFoundError:
-                                pass
-
-            except Exception as e:
-                print(f"Thread {main_category}: Error processing {file_name}: {str(e)}")
-        
-        print(f"Thread completed for category: {main_category}")
-    
-    return process_category
+                parse_start = time.perf_counter()
+                if executor and profiler and profiler.active():
+                    first_page_text, stats_dict = executor.submit(profiled_extract, extractor, pdf_bytes).result()
+                    profiler.add_process_stats(stats_dict)
+                elif executor:
+                    first_page_text = executor.submit(extractor, pdf_bytes).result()
+                else:
+                    first_page_text = extractor(pdf_bytes)
+                prefetcher.record_parse(time.perf_counter() - parse_start)
+                if first_page_text is None:
+                    stats.failed += 1
+                    return
+                if stat_result:
+                    text_cache.put(file_path, stat_result, first_page_text)
+            if profiler:
+                profiler.mark("extraction")
+                
+            # Categorize based on content matching; a manifest hint places the file unread
+            if item.label:
+                main_category, _, sub_category = item.label.partition("/")
+                sub_category = sub_category or None
+            else:
+                main_category, sub_category = score_categories(first_page_text, file_name, categories)
+            stats.classified += 1
+            if profiler:
+                profiler.mark("scoring")
+            if sub_category:
+                destination_folder = os.path.join(root_folder, main_category, sub_category)
+                label = f"{main_category}/{sub_category}"
+            else:
+                destination_folder = os.path.join(root_folder, main_category)
+                label = main_category
+            destination_path = os.path.join(destination_folder, file_name)
+            
+            try:
+                if item.source:
+                    file_mover.write_file(pdf_bytes, destination_path)
+                else:
+                    file_mover.move_file(file_path, destination_path)
+                placed = True
+                file_mover.update_counts(main_category, sub_category)
+                file_mover.record_move(file_name, destination_path, label,
+                                       time.monotonic() - item.enqueued_at)
+                stats.moved += 1
+            except FileNotFoundError:
+                # The source vanishing means another process took the file; anything else is a failure
+                if item.source or os.path.exists(file_path):
+                    stats.failed += 1
+                    print(f"{threading.current_thread().name}: {file_name} not placed, "
+                          f"{destination_folder} does not exist")
+            except FileExistsError:
+                # Never overwrite: the file stays where it is and a bundle holding it is kept
+                stats.failed += 1
+                print(f"{threading.current_thread().name}: {file_name} not placed, "
+                      f"{destination_path} already exists")
+            if profiler:
+                profiler.mark("moving")
+                
+        except Exception as e:
+            stats.failed += 1
+            print(f"{threading.current_thread().name}: Error processing {file_name}: {str(e)}")
+        finally:
+            stats.handled_bytes += item.size
+            if item.source:
+                item.source.finished(item, placed)
+            else:
+                # A file that was not read, such as a text cache hit, still had read-ahead issued
+                prefetcher.discard(file_path)
+            if claimed:
+                claims.release(file_name, handled=not placed)
+    
+    return process_file
 
 def generate_analysis_report(file_counts, total_files):
     """Generate and display the analysis report"""
@@ -235,104 +1828,913 @@ def generate_analysis_report(file_counts, total_files):
     else:
         print("No files found to process.")
 
-    # Display overall statistics
-    if total_moved > 0:
-        percentage_correct = (total_moved / total_moved) * 100
-    else:
-        percentage_correct = 0
-
+    # Display overall statistics; accuracy comes from the evaluate command
     print("\nOverall Statistics:")
     print("-" * 30)
-    #print(f"Total files moved   : {total_moved}")
-    print(f"Processing accuracy : {percentage_correct:.2f}%")
+    print(f"Files in topic folders : {total_moved}")
+    print(f"Files in Others        : {total_files - total_moved}")
+
+def category_labels(categories):
+    """List every placement label, such as "Programming/Python" or "Others\""""
+    return sum([[f"{main}/{sub}" for sub in subcats.keys()] if isinstance(subcats, dict)
+                else [main] for main, subcats in categories.items()], [])
+
+def normalize_label(label, categories):
+    """Accept a full label or a bare subfolder name, and return the full label"""
+    label = label.strip().strip("/")
+    if "/" in label or label in categories:
+        return label
+    matches = [full for full in category_labels(categories) if full.endswith("/" + label)]
+    return matches[0] if len(matches) == 1 else label
+
+def load_labels(labels_path, categories):
+    """Read expected categories from a CSV (path,category) or NDJSON labels file
+    
+    Relative paths are resolved against the labels file's folder.
+    """
+    base_folder = os.path.dirname(os.path.abspath(labels_path))
+    labels = {}
+    with open(labels_path, encoding="utf-8", newline="") as f:
+        if labels_path.endswith((".ndjson", ".jsonl")):
+            rows = ((record["path"], record["category"]) for record in map(json.loads, filter(str.strip, f)))
+        else:
+            import csv
+            rows = (row[:2] for row in csv.reader(f) if len(row) >= 2 and row[:2] != ["path", "category"])
+        for path, category in rows:
+            labels[os.path.join(base_folder, path)] = normalize_label(category, categories)
+    return labels
+
+def extract_file_text(path, extractor=extract_text):
+    """Read and extract one file's text in a worker process, returning (text, error)"""
+    try:
+        with open(path, "rb") as f:
+            return extractor(f.read()), None
+    except Exception as e:
+        return None, str(e)
+
+def classify_labeled_files(labels, categories, text_cache=None, workers=None, extractor=extract_text):
+    """Predict a label for every labeled file without moving anything
+    
+    Cached text is scored directly; the rest is extracted in a process pool.
+    Files without pages are predicted as "(no pages)", unreadable ones as "(error)".
+    """
+    predicted = {}
+    missing = []
+    for path in labels:
+        try:
+            stat_result = os.stat(path)
+        except OSError:
+            predicted[path] = "(error)"
+            continue
+        text = text_cache.get(path, stat_result) if text_cache else None
+        if text is None:
+            missing.append((path, stat_result))
+        else:
+            predicted[path] = "/".join(filter(None, score_categories(text, os.path.basename(path), categories)))
+            
+    if missing:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            paths = [path for path, _ in missing]
+            results = executor.map(functools.partial(extract_file_text, extractor=extractor), paths, chunksize=16)
+            for (path, stat_result), (text, error) in zip(missing, results):
+                if error:
+                    predicted[path] = "(error)"
+                elif text is None:
+                    predicted[path] = "(no pages)"
+                else:
+                    if text_cache:
+                        text_cache.put(path, stat_result, text)
+                    predicted[path] = "/".join(filter(None, score_categories(text, os.path.basename(path), categories)))
+    return predicted
+
+def evaluate_predictions(labels, predicted):
+    """Build a confusion matrix (expected -> predicted -> count) and the misclassified files"""
+    confusion = {}
+    misclassified = []
+    for path, expected in labels.items():
+        actual = predicted.get(path, "(missing)")
+        row = confusion.setdefault(expected, {})
+        row[actual] = row.get(actual, 0) + 1
+        if actual != expected:
+            misclassified.append((path, expected, actual))
+    return confusion, misclassified
+
+def print_evaluation(confusion, misclassified, limit=MISCLASSIFIED_SHOWN):
+    """Display the confusion matrix, per-category precision and recall, and misclassified files"""
+    expected_labels = sorted(confusion)
+    all_labels = sorted(set(expected_labels).union(*(row.keys() for row in confusion.values())))
+    total = sum(sum(row.values()) for row in confusion.values())
+    correct = sum(row.get(label, 0) for label, row in confusion.items())
+    
+    print("\n" + "="*50)
+    print("               EVALUATION REPORT")
+    print("="*50)
+    print(f"\nLabeled files : {total}")
+    print(f"Accuracy      : {(correct / total * 100) if total else 0:.2f}%")
+    
+    # Columns are numbered to keep the matrix narrow; the legend maps them back
+    print("\nConfusion Matrix (rows: expected, columns: predicted):")
+    print("-" * 30)
+    for index, label in enumerate(all_labels, 1):
+        print(f"  [{index:2}] {label}")
+    print(" " * 26 + "".join(f"{index:6}" for index in range(1, len(all_labels) + 1)))
+    for label in expected_labels:
+        row = confusion[label]
+        print(f"{label[:25]:25} " + "".join(f"{row.get(column, 0):6}" for column in all_labels))
+        
+    print("\nPrecision and Recall:")
+    print("-" * 30)
+    for label in all_labels:
+        true_positive = confusion.get(label, {}).get(label, 0)
+        predicted_count = sum(row.get(label, 0) for row in confusion.values())
+        expected_count = sum(confusion.get(label, {}).values())
+        precision = true_positive / predicted_count * 100 if predicted_count else 0
+        recall = true_positive / expected_count * 100 if expected_count else 0
+        print(f"{label:30} : precision {precision:6.2f}%  recall {recall:6.2f}%")
+        
+    print(f"\nMisclassified Files ({len(misclassified)}):")
+    print("-" * 30)
+    for path, expected, actual in misclassified[:limit]:
+        print(f"• {os.path.basename(path):30} expected {expected}, got {actual}")
+    if len(misclassified) > limit:
+        print(f"  ... and {len(misclassified) - limit} more")
+
+def write_misclassified(misclassified, output_path):
+    """Write the full misclassified list as CSV"""
+    import csv
+    with open(output_path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["path", "expected", "predicted"])
+        writer.writerows(misclassified)
+
+def _entry_size(entry):
+    """Size of a scanned file, or 0 if it has gone"""
+    try:
+        return entry.stat().st_size
+    except FileNotFoundError:
+        return 0
+
+def queue_files(root_folder, work_queue, io_scheduler, claims=None, job=None):
+    """Queue the PDFs in root_folder, then the PDFs inside any zip or tar bundles there
+    
+    Under coordination, files this node already handled and files other nodes
+    hold live leases on are skipped. Queued files are claimed only when a
+    worker picks them up.
+    
+    In a batch, each root's files queue behind that root's own backlog
+    (weighted fair queueing), so a large root cannot hold up the small ones.
+    """
+    def put(item, cost):
+        if job:
+            job.queued_cost += cost
+            item.priority += job.queued_cost
+            item.job = job
+        work_queue.put(item)
+        
+    # On rotational disks costs are bucketed, so inode order from the scan survives within a bucket
+    entries = io_scheduler.scan(root_folder)
+    rotational = io_scheduler.kind_of(root_folder) == "rotational"
+    if job:
+        # Smallest first, so the growing backlog keeps the root's own files in shortest-job order;
+        # the sort is stable, so bucketed costs keep their inode order
+        entries.sort(key=lambda entry: cost_bucket(_entry_size(entry)) if rotational else _entry_size(entry))
+    archives = []
+    for entry in entries:
+        if claims and (entry.name in claims.handled or claims.is_live(entry.name)):
+            continue
+        if is_archive(entry.name):
+            archives.append(entry.path)
+            continue
+        try:
+            size = entry.stat().st_size
+        except FileNotFoundError:
+            # Moved by another node since the directory was listed
+            continue
+        pages = None
+        if size > SJF_FAST_LANE_BYTES:
+            with io_scheduler.slot(entry.path):
+                pages = estimate_page_count(entry.path, size)
+        put(WorkItem(entry.path, size, pages, bucketed=rotational), size + (pages or 0) * SJF_PAGE_COST_BYTES)
+        
+    # Bundles come last, since streaming a tar waits on workers to free buffer space
+    queue_archives(archives, io_scheduler, put, claims)
 
-def check_root_folder(root_folder):
-    """Check for any remaining unprocessed files"""
+def queue_archives(archives, io_scheduler, put, claims=None):
+    """Queue the PDF members of zip and tar bundles through put(item, cost)"""
+    if not archives:
+        return
+    import tarfile
+    import zipfile
+    budget = ByteBudget(ARCHIVE_BUFFER_BYTES)
+    for archive_path in archives:
+        # A bundle is claimed as a whole, for as long as its members are in flight
+        archive_name = os.path.basename(archive_path)
+        release = None
+        if claims:
+            if not claims.acquire(archive_name):
+                continue
+            release = lambda name=archive_name: claims.release(name, handled=True)
+            if not os.path.exists(archive_path):
+                release()
+                continue
+        try:
+            for item in ArchiveSource(archive_path, io_scheduler, budget, release).items():
+                put(item, item.size)
+        except (OSError, zipfile.BadZipFile, tarfile.TarError) as e:
+            print(f"Error reading archive {archive_name}: {str(e)}")
+            if release:
+                release()
+
+class ManifestStat:
+    """Size and mtime listed in a manifest, standing in for os.stat() as the text cache key"""
+    __slots__ = ("st_size", "st_mtime_ns")
+    
+    def __init__(self, size, mtime_ns):
+        self.st_size = size
+        self.st_mtime_ns = mtime_ns
+
+def read_manifest(manifest):
+    """Stream (path, size, mtime_ns, category) records from a manifest file object
+    
+    Lines are NDJSON records with "path" and optional "size", "mtime" (seconds)
+    or "mtime_ns" (integer nanoseconds) and "category", or CSV rows
+    path[,size[,mtime[,category]]] with an optional header; both may be mixed.
+    Seconds are read as exact decimals, so all nine fractional digits reach the
+    text cache key. A line that cannot be read is reported and yields None, so
+    the caller can count it and go on.
+    """
+    import csv
+    from decimal import Decimal
+    for number, line in enumerate(manifest, 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        try:
+            if line.startswith("{"):
+                record = json.loads(line, parse_float=Decimal)
+                if not isinstance(record, dict):
+                    raise ValueError("not a JSON object")
+                path, size, mtime, category = (record.get("path"), record.get("size"),
+                                               record.get("mtime"), record.get("category"))
+                if record.get("mtime_ns") is not None:
+                    mtime = Decimal(int(record["mtime_ns"])).scaleb(-9)
+            else:
+                row = next(csv.reader([line]))
+                if row[0] == "path":
+                    continue
+                row += [""] * (4 - len(row))
+                path, size, mtime, category = row[0], row[1] or None, row[2] or None, row[3] or None
+            if not isinstance(path, str) or not path:
+                raise ValueError("missing or invalid path")
+            if category is not None and not isinstance(category, str):
+                raise ValueError("category is not text")
+            size = int(size) if size is not None else None
+            mtime = Decimal(mtime) if mtime is not None else None
+            if (size is not None and size < 0) or (mtime is not None and not mtime.is_finite()):
+                raise ValueError("invalid size or mtime")
+            mtime_ns = int(mtime.scaleb(9)) if mtime is not None else None
+            if mtime_ns is not None and abs(mtime_ns) >= 1 << 63:
+                raise ValueError("mtime out of range")
+        except (ValueError, TypeError, ArithmeticError, csv.Error) as e:
+            print(f"Skipping manifest line {number}: {str(e)}")
+            yield None
+            continue
+        yield path, size, mtime_ns, category
+
+def queue_manifest(manifest, root_folder, work_queue, io_scheduler, categories, claims=None):
+    """Queue the files a manifest lists as it is read, without listing root_folder
+    
+    Relative paths are resolved against root_folder. A listed size spares the
+    stat and no page count is estimated, so no file is opened before a worker
+    takes it. A size with an mtime keys the text cache directly. A category
+    hint naming a known category skips classification; unknown hints are
+    ignored and the file is classified as usual. Returns how many listed
+    files were not found and how many manifest lines were skipped.
+    """
+    known_labels = set(category_labels(categories))
+    archives = []
+    missing = skipped = 0
+    for record in read_manifest(manifest):
+        if record is None:
+            skipped += 1
+            continue
+        path, size, mtime_ns, category = record
+        path = os.path.join(root_folder, path)
+        name = os.path.basename(path)
+        if is_archive(name):
+            archives.append(path)
+            continue
+        if not name.lower().endswith(".pdf"):
+            continue
+        if claims and (name in claims.handled or claims.is_live(name)):
+            continue
+        if size is None:
+            try:
+                size = os.stat(path).st_size
+            except FileNotFoundError:
+                missing += 1
+                continue
+                
+        item = WorkItem(path, size)
+        if mtime_ns is not None:
+            item.stat = ManifestStat(size, mtime_ns)
+        if category:
+            label = normalize_label(category, categories)
+            if label in known_labels:
+                item.label = label
+        work_queue.put(item)
+        
+    queue_archives(archives, io_scheduler, lambda item, cost: work_queue.put(item), claims)
+    return missing, skipped
+
+def check_manifest_run(file_mover, missing, skipped):
+    """Report manifest files that were missing or could not be placed, without listing the root"""
+    failed = sum(stats.failed for stats in file_mover.worker_stats)
+    # Files listed with a size are not stat-ed while queueing; workers count the ones not found
+    missing += sum(stats.missing for stats in file_mover.worker_stats)
+    if skipped:
+        print(f"\nManifest lines skipped as unreadable: {skipped}")
+    if missing:
+        print(f"\nManifest files not found: {missing}")
+    if failed:
+        print(f"\nManifest files that could not be placed: {failed}")
+    # Every listed file should have been placed, so anything missing or unreadable fails the run
+    return not (failed or missing or skipped)
+
+def sweep_until_settled(root_folder, work_queue, io_scheduler, claims):
+    """Keep rescanning until every PDF left in root is handled here or held by a live node
+    
+    This picks up files whose lease expired because the node holding them crashed.
+    """
+    while True:
+        work_queue.wait_idle()
+        queue_files(root_folder, work_queue, io_scheduler, claims)
+        if work_queue.unfinished:
+            continue
+        waiting = [entry.name for entry in io_scheduler.scan(root_folder)
+                   if entry.name not in claims.handled]
+        if not waiting:
+            return
+        time.sleep(claims.heartbeat)
+
+def check_root_folder(root_folder, file_mover=None):
+    """Check for any remaining unprocessed files, and for bundle members that could not be placed"""
     remaining_files = [f for f in os.listdir(root_folder) if f.endswith('.pdf')]
     if remaining_files:
         print("\nUnprocessed Files:")
         print("-" * 30)
         for file in remaining_files:
             print(f"• {file}")
-        return False
-    return True
+    # A member that failed leaves its bundle behind, not a PDF, so it shows only in the counters
+    failed = sum(stats.failed for stats in file_mover.worker_stats) if file_mover else 0
+    if failed:
+        print(f"\nFiles that could not be placed: {failed}")
+    return not (remaining_files or failed)
 
-# Main Execution
-if __name__ == "__main__":
+def counts_from_move_logs(move_log_paths, categories):
+    """Rebuild per-category file counts from the move logs of a run
+    
+    Labels the given categories do not define, such as those of a run with
+    other --categories, are counted under their own names.
+    """
+    file_counts = empty_counts(categories)
+    for move_log_path in move_log_paths:
+        for record in read_move_log(move_log_path):
+            main_cat, _, sub_cat = record["category"].partition("/")
+            if sub_cat:
+                sub_counts = file_counts.setdefault(main_cat, {})
+                if not isinstance(sub_counts, dict):
+                    # A main category with files of its own as well as subfolders
+                    sub_counts = file_counts[main_cat] = {main_cat: sub_counts}
+                sub_counts[sub_cat] = sub_counts.get(sub_cat, 0) + 1
+            elif isinstance(file_counts.get(main_cat), dict):
+                file_counts[main_cat][main_cat] = file_counts[main_cat].get(main_cat, 0) + 1
+            else:
+                file_counts[main_cat] = file_counts.get(main_cat, 0) + 1
+    return file_counts
+
+def print_movement_log(move_log_path):
+    """Display every move recorded in a run's move log"""
+    print("\n" + "="*50)
+    print("            MOVEMENT LOG")
+    print("="*50)
+    for record in read_move_log(move_log_path):
+        print(f"{record['file']:30} → {record['category']}")
+
+class BatchJob:
+    """One root of a batch run: its category model, output tree, mover and finish time"""
+    def __init__(self, root_folder, output_folder, categories, file_mover):
+        self.root_folder = root_folder
+        self.output_folder = output_folder
+        self.categories = categories
+        self.file_mover = file_mover
+        self.process_file = None
+        
+        # Cost queued so far, for fair queueing, when the root's latest file was done,
+        # and whether its scan failed part way
+        self.queued_cost = 0
+        self.finished_at = None
+        self.scan_failed = False
+        
+    def process(self, item):
+        """Handle one of this root's files"""
+        self.process_file(item)
+        self.finished_at = time.time()
+
+def load_jobs(jobs_path):
+    """Read batch roots: one folder per line, or NDJSON records with root, categories and output
+    
+    Relative paths are resolved against the jobs file's folder; the output
+    tree defaults to the root itself.
+    """
+    base_folder = os.path.dirname(os.path.abspath(jobs_path))
+    jobs = []
+    with open(jobs_path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            record = json.loads(line) if line.startswith("{") else {"root": line}
+            root_folder = os.path.join(base_folder, record["root"])
+            jobs.append({
+                "root": root_folder,
+                "categories": os.path.join(base_folder, record["categories"]) if record.get("categories") else None,
+                "output": os.path.join(base_folder, record["output"]) if record.get("output") else root_folder,
+            })
+    return jobs
+
+def run_command(args):
+    """Categorize the PDFs in a root folder"""
     # Program header
     print("\n" + "="*50)
     print("          PDF FILE CATEGORIZATION")
     print("="*50)
     
-    # Get input and initialize
-    root_folder = input("\nEnter the path to the root folder: ").strip()
+    # Get input and initialize; prompt only when no folder was given
+    root_folder = args.root
+    if root_folder is None and args.manifest == "-":
+        print("\nA root folder is required when the manifest is read from stdin")
+        return 2
+    if root_folder is None:
+        root_folder = input("\nEnter the path to the root folder: ").strip()
     print("\nInitializing folder structure...")
-    categories = create_folder_structure(root_folder)
+    categories = create_folder_structure(root_folder, load_categories(args.categories))
     
     # Start processing
     start_time = time.time()
     print("\nStarting file categorization...")
     
+    # Under coordination each node claims files through lease files and keeps its own move log
+    claims = None
+    move_log_name = MOVE_LOG_NAME
+    if args.coordinate:
+        import socket
+        node_id = args.node_id or f"{socket.gethostname()}-{os.getpid()}"
+        claims = ClaimStore(os.path.join(root_folder, CLAIMS_FOLDER_NAME), node_id, spill=args.spill_state)
+        claims.start()
+        move_log_name = MOVE_LOG_NAME.replace(".ndjson", f".{node_id}.ndjson")
+        print(f"Coordinating as node {node_id}")
+    
     # Initialize thread-safe file mover
-    file_mover = ThreadSafeFileMover()
-    file_mover.file_counts = {main_cat: {sub_cat: 0 for sub_cat in sub_cats.keys()} if isinstance(sub_cats, dict) else 0 
-                             for main_cat, sub_cats in categories.items()}
-    
-    # Create and start threads
-    threads = []
-    category_processor = categorize_and_move_files(root_folder, categories, file_mover)
-    main_categories = [cat for cat in categories.keys() if cat != "Others"]
-    
-    # Process main categories
-    for main_category in main_categories:
-        thread = threading.Thread(target=category_processor, args=(main_category,))
-        threads.append(thread)
-        thread.start()
-        print(f"Started thread for {main_category}")
-    
-    # Wait for main categories to complete
-    for thread in threads[:-1]:
-        thread.join()
-    
-    # Process Others category last
-    others_thread = threading.Thread(target=category_processor, args=("Others",))
-    others_thread.start()
-    others_thread.join()
+    file_mover = ThreadSafeFileMover(categories, os.path.join(root_folder, move_log_name), spill=args.spill_state,
+                                     track_files=bool(args.labels))
+    
+    # Workers do the I/O; extraction optionally runs in a process pool
+    work_queue = WorkQueue()
+    executor = None
+    if args.processes:
+        from concurrent.futures import ProcessPoolExecutor
+        executor = ProcessPoolExecutor(max_workers=args.max_workers)
+    extractor, cache_table = (extract_text_fast, "fast_texts") if args.fast_extract else (extract_text, "texts")
+    text_cache = TextCache(args.text_cache, cache_table) if args.text_cache else None
+    profiler = None
+    if args.profile or args.profile_memory:
+        profiler = RunProfiler(args.profile, args.profile_memory, args.profile_sample)
+    file_processor = categorize_and_move_files(root_folder, categories, file_mover, work_queue,
+                                               executor, text_cache, claims, extractor, profiler)
     
+    # Only the workers' file handling is profiled, not scanning or setup
+    if profiler:
+        file_processor = profiler.wrap(file_processor)
+    pool = WorkerPool(work_queue, file_processor)
+    fast_pool = WorkerPool(work_queue, file_processor, lane="fast")
+    controller = PoolController(pool, work_queue, args.min_workers, args.max_workers)
+    controller.start()
+    fast_pool.resize(args.fast_lane_workers)
+    progress = None
+    if args.progress != "off":
+        progress = ProgressReporter(work_queue, [file_mover], args.progress)
+        progress.start()
+    
+    # Queue every PDF in the root folder, or every file the manifest lists as it streams in;
+    # workers start on the cheapest ones right away
+    missing = skipped = 0
+    try:
+        if args.manifest:
+            manifest = sys.stdin if args.manifest == "-" else open(args.manifest, encoding="utf-8")
+            try:
+                missing, skipped = queue_manifest(manifest, root_folder, work_queue, file_mover.io_scheduler,
+                                                  categories, claims)
+            finally:
+                if manifest is not sys.stdin:
+                    manifest.close()
+        else:
+            queue_files(root_folder, work_queue, file_mover.io_scheduler, claims)
+            if claims:
+                sweep_until_settled(root_folder, work_queue, file_mover.io_scheduler, claims)
+    finally:
+        # Let the workers finish and flush the move log even if scanning failed
+        work_queue.close()
+        pool.join()
+        fast_pool.join()
+        controller.stop()
+        if progress:
+            progress.stop()
+        if claims:
+            claims.stop()
+            if claims.reclaimed:
+                print(f"Reclaimed {claims.reclaimed} expired leases from stopped nodes")
+        file_mover.close()
+        if text_cache:
+            text_cache.close()
+        if executor:
+            executor.shutdown()
+            
     # Post-processing checks and reports
-    all_moved = check_root_folder(root_folder)
+    # Listing a huge root is what a manifest avoids, so its run is checked from the counters
+    all_moved = check_manifest_run(file_mover, missing, skipped) if args.manifest else check_root_folder(root_folder, file_mover)
+    file_counts = file_mover.merged_counts()
     total_files = sum(sum(counts.values()) if isinstance(counts, dict) else counts 
-                     for counts in file_mover.file_counts.values())
+                     for counts in file_counts.values())
     time_taken = time.time() - start_time
-    # User validation
-    validate = input("\nWould you like to validate the correctness of file categorization? (y/n): ").lower()
-    if validate == 'y':
-        validator = FileValidator()
-        print("\nFor each file, please enter the correct subfolder name.")
-        print("Available subfolders:", ", ".join(sum([[f"{main}/{sub}" 
-              for sub in subcats.keys()] if isinstance(subcats, dict) 
-              else [main] for main, subcats in categories.items()], [])))
-        
-        for filename in file_mover.file_locations.keys():
-            correct_path = input(f"\nCorrect subfolder for {filename}: ").strip()
-            validator.add_correct_path(filename, correct_path)
-        
-        accuracy = validator.calculate_accuracy(file_mover.file_locations)
-        print(f"\nUser Validation Accuracy: {accuracy:.2f}%")
+    # Score the placements against a labels file
+    if args.labels:
+        labels = load_labels(args.labels, categories)
+        predicted = {path: file_mover.file_table.get(os.path.basename(path), "(not moved)") for path in labels}
+        confusion, misclassified = evaluate_predictions(labels, predicted)
+        print_evaluation(confusion, misclassified)
+        file_mover.file_table.close()
     
     # Display results
+    print_movement_log(file_mover.move_log_path)
+    
     print("\n" + "="*50)
-    print("            MOVEMENT LOG")
+    print("          POOL CONTROLLER LOG")
     print("="*50)
-    if hasattr(file_mover, 'moves_log'):
-        for move in file_mover.moves_log:
-            print(move)
+    for decision in controller.decisions:
+        print(decision)
     
     # Generate final reports
-    generate_analysis_report(file_mover.file_counts, total_files)
+    generate_analysis_report(file_counts, total_files)
+    if profiler:
+        profiler.finish()
     
     print("\nExecution Summary:")
     print("-" * 30)
     print(f"Time taken to Categorize all files : {time_taken:.2f} seconds")
-    print(f"Final status: {'✓ Success' if all_moved else '✗ Failed - files remain in root'}")
+    placements = file_mover.merged_placements()
+    if placements.count:
+        print(f"Median time-to-placement           : {placements.median():.2f} seconds")
+    if progress:
+        print(f"Progress reporting overhead        : {progress.overhead() * 100:.3f}% of wall time")
+    print(f"Final status: {'✓ Success' if all_moved else '✗ Failed - some files were not placed'}")
+    print("="*50)
+    return 0 if all_moved else 1
+
+def batch_command(args):
+    """Categorize many roots in one process, sharing the worker pool, extraction processes and caches"""
+    print("\n" + "="*50)
+    print("       BATCH PDF FILE CATEGORIZATION")
+    print("="*50)
+    start_time = time.time()
+    
+    # Roots naming the same category file share one loaded model; all share the I/O limits
+    models = {}
+    io_scheduler = IOScheduler()
+    prefetcher = Prefetcher(io_scheduler)
+    jobs = []
+    for spec in load_jobs(args.jobs):
+        if not os.path.isdir(spec["root"]):
+            print(f"Skipping {spec['root']}: not a folder")
+            continue
+        categories = models.get(spec["categories"])
+        if categories is None:
+            categories = models[spec["categories"]] = load_categories(spec["categories"])
+        create_folder_structure(spec["output"], categories)
+        file_mover = ThreadSafeFileMover(categories, os.path.join(spec["output"], MOVE_LOG_NAME),
+                                         io_scheduler, args.spill_state, prefetcher)
+        jobs.append(BatchJob(spec["root"], spec["output"], categories, file_mover))
+    print(f"\nStarting file categorization of {len(jobs)} roots...")
+    
+    # One warm pool serves every root; each queued file carries its job
+    work_queue = WorkQueue()
+    executor = None
+    if args.processes:
+        from concurrent.futures import ProcessPoolExecutor
+        executor = ProcessPoolExecutor(max_workers=args.max_workers)
+    extractor, cache_table = (extract_text_fast, "fast_texts") if args.fast_extract else (extract_text, "texts")
+    text_cache = TextCache(args.text_cache, cache_table) if args.text_cache else None
+    profiler = None
+    if args.profile or args.profile_memory:
+        profiler = RunProfiler(args.profile, args.profile_memory, args.profile_sample)
+    for job in jobs:
+        job.process_file = categorize_and_move_files(job.output_folder, job.categories, job.file_mover,
+                                                     work_queue, executor, text_cache, extractor=extractor,
+                                                     profiler=profiler)
+    dispatch = lambda item: item.job.process(item)
+    if profiler:
+        dispatch = profiler.wrap(dispatch)
+    pool = WorkerPool(work_queue, dispatch)
+    fast_pool = WorkerPool(work_queue, dispatch, lane="fast")
+    controller = PoolController(pool, work_queue, args.min_workers, args.max_workers)
+    controller.start()
+    fast_pool.resize(args.fast_lane_workers)
+    progress = None
+    if args.progress != "off":
+        progress = ProgressReporter(work_queue, [job.file_mover for job in jobs], args.progress)
+        progress.start()
+    
+    def scan_root(job):
+        try:
+            queue_files(job.root_folder, work_queue, io_scheduler, job=job)
+        except Exception as e:
+            job.scan_failed = True
+            print(f"Error scanning {job.root_folder}: {str(e)}")
+            
+    # Roots are scanned side by side, so the fair queue starts on every root's cheap files
+    # without waiting for earlier roots to be listed; page-count reads keep the device limits
+    from concurrent.futures import ThreadPoolExecutor
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, min(len(jobs), BATCH_SCAN_THREADS)),
+                                thread_name_prefix="Scanner") as scanners:
+            for job in jobs:
+                scanners.submit(scan_root, job)
+    finally:
+        # Let the workers finish and flush every root's move log even if scanning failed
+        work_queue.close()
+        pool.join()
+        fast_pool.join()
+        controller.stop()
+        if progress:
+            progress.stop()
+        for job in jobs:
+            job.file_mover.close()
+        if text_cache:
+            text_cache.close()
+        if executor:
+            executor.shutdown()
+            
+    # Per-root reports, then one line per root
+    summary = []
+    for job in jobs:
+        print("\n" + "="*50)
+        print(f"ROOT: {job.root_folder}")
+        print("="*50)
+        moved = check_root_folder(job.root_folder, job.file_mover) and not job.scan_failed
+        file_counts = job.file_mover.merged_counts()
+        total_files = sum(sum(counts.values()) if isinstance(counts, dict) else counts
+                         for counts in file_counts.values())
+        generate_analysis_report(file_counts, total_files)
+        done_after = job.finished_at - start_time if job.finished_at else 0
+        summary.append((job.root_folder, total_files, done_after, moved))
+    if profiler:
+        profiler.finish()
+        
+    print("\n" + "="*50)
+    print("             BATCH SUMMARY")
+    print("="*50)
+    print(f"{'Root':40} {'Files':>8} {'Done after':>11}  Status")
+    print("-" * 70)
+    for root_folder, total_files, done_after, moved in summary:
+        print(f"{root_folder[-40:]:40} {total_files:8} {done_after:10.2f}s  {'✓' if moved else '✗'}")
+    all_moved = all(moved for _, _, _, moved in summary)
+    print(f"\nTime taken to Categorize all roots : {time.time() - start_time:.2f} seconds")
+    if progress:
+        print(f"Progress reporting overhead        : {progress.overhead() * 100:.3f}% of wall time")
+    print(f"Final status: {'✓ Success' if all_moved else '✗ Failed - files were not placed in a root'}")
     print("="*50)
+    return 0 if all_moved else 1
+
+def tree_command(args):
+    """List the category folders under a root folder with their PDF counts"""
+    for main_cat, subcats in load_categories(args.categories).items():
+        main_path = os.path.join(args.root, main_cat)
+        if not os.path.isdir(main_path):
+            continue
+        pdf_count = sum(1 for f in os.listdir(main_path) if f.endswith('.pdf'))
+        print(f"{main_cat + '/':25} {pdf_count:6} files")
+        if isinstance(subcats, dict):
+            for sub_cat in subcats:
+                sub_path = os.path.join(main_path, sub_cat)
+                if os.path.isdir(sub_path):
+                    pdf_count = sum(1 for f in os.listdir(sub_path) if f.endswith('.pdf'))
+                    print(f"  └─{sub_cat + '/':21} {pdf_count:6} files")
+    return 0
+
+def report_command(args):
+    """Show the movement log and analysis report of the last run, merging every node's log"""
+    move_log_paths = sorted(glob.glob(os.path.join(glob.escape(args.root), MOVE_LOG_NAME.replace(".ndjson", "*.ndjson"))))
+    if not move_log_paths:
+        print(f"No move log found in {args.root}")
+        return 1
+    file_counts = counts_from_move_logs(move_log_paths, load_categories(args.categories))
+    total_files = sum(sum(counts.values()) if isinstance(counts, dict) else counts
+                     for counts in file_counts.values())
+    if args.moves:
+        for move_log_path in move_log_paths:
+            print_movement_log(move_log_path)
+    generate_analysis_report(file_counts, total_files)
+    return 0
+
+def evaluate_command(args):
+    """Classify labeled files without moving them and report how well it went"""
+    categories = load_categories(args.categories)
+    labels = load_labels(args.labels, categories)
+    extractor, cache_table = (extract_text_fast, "fast_texts") if args.fast_extract else (extract_text, "texts")
+    text_cache = TextCache(args.text_cache, cache_table) if args.text_cache else None
+    
+    start_time = time.time()
+    predicted = classify_labeled_files(labels, categories, text_cache, args.workers, extractor)
+    if text_cache:
+        text_cache.close()
+    confusion, misclassified = evaluate_predictions(labels, predicted)
+    print_evaluation(confusion, misclassified)
+    if args.misclassified:
+        write_misclassified(misclassified, args.misclassified)
+    print(f"\nEvaluated {len(labels)} files in {time.time() - start_time:.2f} seconds")
+    return 0
+
+def compare_extractors_command(args):
+    """Report how often the fast extractor agrees with extract_text, and how much faster it is"""
+    import statistics
+    import PyPDF2
+    categories = define_categories()
+    paths = sorted(os.path.join(folder, name) for folder, _, names in os.walk(args.corpus)
+                   for name in names if name.lower().endswith(".pdf"))[:args.limit]
+    
+    def open_reader(pdf_bytes):
+        return PyPDF2.PdfReader(io.BytesIO(pdf_bytes))
+        
+    compared = fast_used = agreed = 0
+    open_times = []
+    slow_times = []
+    fast_times = []
+    disagreements = []
+    for path in paths:
+        try:
+            with open(path, "rb") as f:
+                pdf_bytes = f.read()
+                
+            # Reading the xref and trailer costs both extractors the same, so it is timed on its own;
+            # each extractor then works on a fresh reader so neither reuses the other's parsing
+            start = time.perf_counter()
+            pdf_reader = open_reader(pdf_bytes)
+            open_time = time.perf_counter() - start
+            if not pdf_reader.pages:
+                continue
+                
+            pdf_reader = open_reader(pdf_bytes)
+            start = time.perf_counter()
+            slow_text = pdf_reader.pages[0].extract_text().lower()
+            slow_time = time.perf_counter() - start
+            
+            # The fast path as extract_text_fast runs it, fallback included
+            pdf_reader = open_reader(pdf_bytes)
+            start = time.perf_counter()
+            try:
+                page, resources = first_page(pdf_reader)
+                fast_text = fast_page_text(page, resources) if page is not None else None
+            except Exception:
+                fast_text = None
+            fell_back = not fast_text
+            if fell_back:
+                fast_text = pdf_reader.pages[0].extract_text().lower()
+            fast_time = time.perf_counter() - start
+        except Exception as e:
+            print(f"• {os.path.basename(path)}: {str(e)}")
+            continue
+            
+        compared += 1
+        open_times.append(open_time)
+        slow_times.append(slow_time)
+        fast_times.append(fast_time)
+        if fell_back:
+            continue
+            
+        # Agreement is only measured where the fast path produced the text itself
+        fast_used += 1
+        name = os.path.basename(path)
+        expected = score_categories(slow_text, name, categories)
+        actual = score_categories(fast_text, name, categories)
+        if expected == actual:
+            agreed += 1
+        else:
+            disagreements.append((name, "/".join(filter(None, expected)), "/".join(filter(None, actual))))
+            
+    print("\n" + "="*50)
+    print("           EXTRACTOR COMPARISON")
+    print("="*50)
+    if not compared:
+        print("No readable PDFs found.")
+        return 1
+    print(f"\nFiles compared        : {compared}")
+    print(f"Fast path used        : {fast_used} ({fast_used / compared * 100:.2f}%), "
+          f"the rest fell back to extract_text")
+    if fast_used:
+        print(f"Same category         : {agreed / fast_used * 100:.2f}% of the files the fast path read")
+    opened = sum(open_times)
+    print(f"Open median           : {statistics.median(open_times) * 1000:.2f} ms/file")
+    print(f"extract_text median   : {statistics.median(slow_times) * 1000:.2f} ms/page")
+    print(f"Fast median           : {statistics.median(fast_times) * 1000:.2f} ms/page (fallbacks included)")
+    print(f"Speedup (after open)  : {sum(slow_times) / sum(fast_times):.1f}x")
+    print(f"Speedup (with open)   : {(opened + sum(slow_times)) / (opened + sum(fast_times)):.1f}x")
+    if disagreements:
+        print("\nDisagreements:")
+        print("-" * 30)
+        for name, expected, actual in disagreements[:MISCLASSIFIED_SHOWN]:
+            print(f"• {name:30} extract_text {expected}, fast {actual}")
+    return 0
+
+def build_parser():
+    """Build the command-line parser and its subcommands"""
+    parser = argparse.ArgumentParser(prog="dora", description="Categorize PDF files into topic folders")
+    subparsers = parser.add_subparsers(dest="command")
+    
+    # Pool, extraction and state options shared by run and batch
+    pool_options = argparse.ArgumentParser(add_help=False)
+    pool_options.add_argument("--min-workers", type=int, default=POOL_MIN_WORKERS, help="worker pool floor")
+    pool_options.add_argument("--max-workers", type=int, default=POOL_MAX_WORKERS, help="worker pool ceiling")
+    pool_options.add_argument("--fast-lane-workers", type=int, default=FAST_LANE_WORKERS,
+                              help="workers reserved for small files")
+    pool_options.add_argument("--processes", action="store_true", default=EXTRACT_IN_PROCESSES,
+                              help="extract text in worker processes")
+    pool_options.add_argument("--text-cache", help="SQLite file to reuse and store extracted text in")
+    pool_options.add_argument("--fast-extract", action="store_true",
+                              help="read text straight from content streams instead of full layout extraction")
+    pool_options.add_argument("--spill-state", action="store_true",
+                              help="keep file names tracked for --labels or --coordinate on disk, not in memory")
+    pool_options.add_argument("--progress", choices=["auto", "tty", "json", "off"], default="auto",
+                              help="live progress on stderr: a status line on a terminal, JSON lines otherwise")
+    pool_options.add_argument("--profile", metavar="PSTATS",
+                              help="profile extraction, scoring and moving into this pstats file")
+    pool_options.add_argument("--profile-memory", action="store_true",
+                              help="show the top allocation sites per stage, traced with tracemalloc "
+                                   "(pauses all workers at each snapshot; for diagnosis, not production)")
+    pool_options.add_argument("--profile-sample", type=int, default=1, metavar="N",
+                              help="profile only every Nth file")
+    
+    run_parser = subparsers.add_parser("run", parents=[pool_options], help="categorize the PDFs in a root folder")
+    run_parser.add_argument("root", nargs="?", help="root folder (prompted for when omitted)")
+    run_parser.add_argument("--categories", help="JSON keyword definitions to use instead of the built-in ones")
+    run_parser.add_argument("--labels", help="CSV or NDJSON labels file to score the placements against")
+    run_parser.add_argument("--coordinate", action="store_true",
+                            help="share the root folder with other processes or hosts through lease files")
+    run_parser.add_argument("--node-id", help="name of this node in lease files (default: host-pid)")
+    run_parser.add_argument("--manifest", metavar="FILE",
+                            help="NDJSON or CSV list of files to process instead of listing the root ('-' for stdin)")
+    run_parser.set_defaults(handler=run_command)
+    
+    batch_parser = subparsers.add_parser("batch", parents=[pool_options],
+                                         help="categorize many root folders with one shared worker pool")
+    batch_parser.add_argument("jobs", help="file listing one root per line, or NDJSON with root, categories and output")
+    batch_parser.set_defaults(handler=batch_command)
+    
+    tree_parser = subparsers.add_parser("tree", help="list the category folders and their file counts")
+    tree_parser.add_argument("root", help="root folder")
+    tree_parser.add_argument("--categories", help="JSON keyword definitions the run used")
+    tree_parser.set_defaults(handler=tree_command)
+    
+    report_parser = subparsers.add_parser("report", help="show the report of the last run")
+    report_parser.add_argument("root", help="root folder")
+    report_parser.add_argument("--moves", action="store_true", help="include the movement log")
+    report_parser.add_argument("--categories", help="JSON keyword definitions the run used")
+    report_parser.set_defaults(handler=report_command)
+    
+    evaluate_parser = subparsers.add_parser("evaluate", help="score classification against labeled files without moving them")
+    evaluate_parser.add_argument("labels", help="CSV (path,category) or NDJSON labels file")
+    evaluate_parser.add_argument("--categories", help="JSON keyword definitions to evaluate")
+    evaluate_parser.add_argument("--text-cache", help="SQLite file to reuse and store extracted text in")
+    evaluate_parser.add_argument("--workers", type=int, help="extraction processes for uncached files")
+    evaluate_parser.add_argument("--fast-extract", action="store_true", help="evaluate the content-stream extractor")
+    evaluate_parser.add_argument("--misclassified", help="write every misclassified file to this CSV")
+    evaluate_parser.set_defaults(handler=evaluate_command)
+    
+    compare_parser = subparsers.add_parser("compare-extractors",
+                                           help="compare the fast extractor with extract_text on a corpus")
+    compare_parser.add_argument("corpus", help="folder of PDFs, searched recursively")
+    compare_parser.add_argument("--limit", type=int, help="compare at most this many files")
+    compare_parser.set_defaults(handler=compare_extractors_command)
+    
+    return parser
+
+def main(argv=None):
+    """Command-line entry point; with no subcommand, runs interactively as before"""
+    parser = build_parser()
+    argv = sys.argv[1:] if argv is None else argv
+    args = parser.parse_args(argv or ["run"])
+    return args.handler(args)
+
+# Main Execution
+if __name__ == "__main__":
+    sys.exit(main())